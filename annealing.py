@@ -0,0 +1,184 @@
+# annealing.py
+# 탐색 전략(이동 수락 규칙)과 담금질 냉각 스케줄
+import math
+import random
+import logging
+
+
+# ==========================================
+# [냉각 스케줄]
+# progress는 0(시작) ~ 1(제한 시간 끝) 사이의 진행률
+# ==========================================
+class GeometricSchedule:
+    """T = T0 * (T_end / T0) ^ progress (지수적으로 감소)"""
+    name = 'geometric'
+
+    def __init__(self, t0, t_end):
+        self.t0 = t0
+        self.t_end = t_end
+
+    def temperature(self, progress, since_best=0):
+        return self.t0 * (self.t_end / self.t0) ** progress
+
+
+class LinearSchedule:
+    """T = T0 + (T_end - T0) * progress (직선으로 감소)"""
+    name = 'linear'
+
+    def __init__(self, t0, t_end):
+        self.t0 = t0
+        self.t_end = t_end
+
+    def temperature(self, progress, since_best=0):
+        return self.t0 + (self.t_end - self.t0) * progress
+
+
+class ReheatSchedule:
+    """지수 냉각 + 정체 시 재가열.
+    최고 점수가 patience회 동안 갱신되지 않으면 T0 * reheat_ratio에서 남은 시간 동안 다시 식힌다."""
+    name = 'reheat'
+
+    def __init__(self, t0, t_end, patience=20000, reheat_ratio=0.5):
+        self.t0 = t0
+        self.t_end = t_end
+        self.patience = patience
+        self.reheat_ratio = reheat_ratio
+        self.t_start = t0
+        self.start_progress = 0.0
+        self.stall_mark = 0  # 마지막으로 재가열했을 때의 정체 길이
+        self.reheats = 0
+
+    def temperature(self, progress, since_best=0):
+        if since_best < self.stall_mark:
+            self.stall_mark = 0  # 그 사이 최고 점수가 갱신됨
+        if since_best - self.stall_mark >= self.patience and progress < 0.9:
+            self.t_start = self.t0 * self.reheat_ratio
+            self.start_progress = progress
+            self.stall_mark = since_best
+            self.reheats += 1
+
+        span = 1.0 - self.start_progress
+        local = (progress - self.start_progress) / span if span > 0 else 1.0
+        return self.t_start * (self.t_end / self.t_start) ** min(1.0, local)
+
+
+SCHEDULES = {
+    'geometric': GeometricSchedule,
+    'linear': LinearSchedule,
+    'reheat': ReheatSchedule,
+}
+
+
+def make_schedule(name, t0, t_end=None):
+    if name not in SCHEDULES:
+        raise ValueError(f"알 수 없는 냉각 스케줄: {name} (가능: {', '.join(SCHEDULES)})")
+    if t_end is None:
+        t_end = t0 * 1e-3
+    return SCHEDULES[name](t0, t_end)
+
+
+def initial_temperature(sol, samples=300, accept_prob=0.5):
+    """무작위 이동을 samples번 시험해, 평균적인 악화 이동이 accept_prob 확률로 수락되는 온도.
+    시험한 이동은 모두 되돌린다."""
+    worse = []
+    for _ in range(samples):
+        prev = sol.score
+        changed = sol.mutate()
+        if not changed: continue
+        delta = sol.update_scores(changed) - prev
+        sol.undo()
+        if delta < 0:
+            worse.append(-delta)
+
+    if not worse:
+        return 1.0
+    return (sum(worse) / len(worse)) / -math.log(accept_prob)
+
+
+# ==========================================
+# [수락 규칙]
+# ==========================================
+class AcceptanceStats:
+    """제안/수락/거절 횟수"""
+
+    def __init__(self):
+        self.proposed = 0
+        self.improving = 0
+        self.sideways = 0
+        self.worsening = 0
+        self.rejected = 0
+
+    @property
+    def accepted(self):
+        return self.improving + self.sideways + self.worsening
+
+    def rate(self):
+        return self.accepted / self.proposed if self.proposed else 0.0
+
+    def summary(self):
+        return (f"제안 {self.proposed}, 수락률 {self.rate():.1%} "
+                f"(개선 {self.improving}, 동점 {self.sideways}, 악화 {self.worsening}), 거절 {self.rejected}")
+
+
+class HillClimbAcceptor:
+    """점수가 떨어지지 않는 이동만 수락 (기존 방식)"""
+    name = 'hill_climb'
+
+    def __init__(self):
+        self.stats = AcceptanceStats()
+
+    def update(self, progress, since_best):
+        pass
+
+    def accept(self, delta):
+        st = self.stats
+        st.proposed += 1
+        if delta > 0:
+            st.improving += 1
+            return True
+        if delta == 0:
+            st.sideways += 1
+            return True
+        st.rejected += 1
+        return False
+
+
+class AnnealingAcceptor:
+    """메트로폴리스 기준: 악화 이동도 exp(delta / T) 확률로 수락"""
+    name = 'annealing'
+
+    def __init__(self, schedule, rng=random):
+        self.schedule = schedule
+        self.rng = rng
+        self.temperature = schedule.t0
+        self.stats = AcceptanceStats()
+        # 구간별 수락률 기록 (진행률 10% 단위)
+        self.window = AcceptanceStats()
+        self.next_report = 0.1
+
+    def update(self, progress, since_best):
+        self.temperature = max(self.schedule.temperature(progress, since_best), 1e-12)
+        if progress >= self.next_report:
+            logging.debug(f"[담금질] 진행 {progress:.0%}, T={self.temperature:.4g}, 구간 수락률 {self.window.rate():.1%}")
+            self.window = AcceptanceStats()
+            self.next_report += 0.1
+
+    def accept(self, delta):
+        st, win = self.stats, self.window
+        st.proposed += 1
+        win.proposed += 1
+        if delta > 0:
+            st.improving += 1
+            win.improving += 1
+            return True
+        if delta == 0:
+            st.sideways += 1
+            win.sideways += 1
+            return True
+        if self.rng.random() < math.exp(delta / self.temperature):
+            st.worsening += 1
+            win.worsening += 1
+            return True
+        st.rejected += 1
+        win.rejected += 1
+        return False
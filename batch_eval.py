@@ -0,0 +1,95 @@
+# batch_eval.py
+# NumPy로 여러 배치를 한 번에 채점 (집단 탐색/이웃 전체 스캔용)
+# 배치 하나 = 칸별 아이템 인덱스(-1 = 빈칸)와 회전값 배열. 결과는 Solution.evaluate()와 정확히 같다.
+import random
+
+import numpy as np
+
+from bitboard import iter_bits
+
+
+class BatchEvaluator:
+    """Solution 하나의 아이템 목록/그리드 크기에 대해 사전 계산한 배열로 K개 배치를 채점"""
+
+    def __init__(self, sol):
+        n = sol.size
+        m = len(sol.items)
+        self.size = n
+        self.empty_id = m  # 빈칸은 m번 행(모두 0)으로 매핑
+
+        # influence[item, rot, src, dst]: src 칸의 석판이 dst 칸에 주는 값
+        self.influence = np.zeros((m + 1, 4, n, n), dtype=np.int32)
+        # mult[item, cell]: 그 칸에 놓인 아티팩트의 버프 배율 (필수 x2, 열쇠 행/천칭 좌우 불일치 0)
+        self.mult = np.zeros((m + 1, n), dtype=np.int32)
+        # enchant[item]: 아티팩트 강화 수치, harmony[item]: 조화의 수정 여부
+        self.enchant = np.zeros(m + 1, dtype=np.int32)
+        self.harmony = np.zeros(m + 1, dtype=np.int32)
+
+        for i, item in enumerate(sol.items):
+            self.mult[i] = sol.buff_mult[i]
+            if item.item_type == 'Artifact':
+                self.enchant[i] = item.current_enchant
+                self.harmony[i] = 1 if item.constraint and 'harmony' in item.constraint else 0
+            else:
+                for rot, per_cell in enumerate(sol.influence[i]):
+                    for src, targets in enumerate(per_cell):
+                        for dst, v in targets:
+                            self.influence[i, rot, src, dst] += v
+
+        # 조화의 수정 주변 8칸 인접 행렬
+        self.adjacency = np.zeros((n, n), dtype=np.int32)
+        for cell, mask in enumerate(sol.masks.neighbor_masks):
+            for nb in iter_bits(mask):
+                self.adjacency[cell, nb] = 1
+
+        self._cells = np.arange(n)
+
+    def evaluate(self, item_ids, rotations):
+        """item_ids, rotations: (K, 칸 수) 정수 배열 -> (K,) 점수 배열"""
+        ids = np.asarray(item_ids)
+        ids = np.where(ids < 0, self.empty_id, ids)
+        rots = np.asarray(rotations)
+
+        # 석판 효과: 칸마다 (놓인 석판, 회전)의 영향 행 (K, src, dst)을 모아 대상 칸 배율과 곱한다
+        gathered = self.influence[ids, rots, self._cells[None, :]]
+        target_mult = self.mult[ids, self._cells[None, :]]
+        tablet_score = np.einsum('kst,kt->k', gathered, target_mult, dtype=np.int64)
+
+        # 조화의 수정: 주변 8칸 강화 수치 합
+        enchant = self.enchant[ids]
+        neighbor_sum = enchant @ self.adjacency.T
+        harmony_score = (self.harmony[ids] * neighbor_sum).sum(axis=1, dtype=np.int64)
+        return tablet_score + harmony_score
+
+
+def snapshots_to_arrays(snapshots):
+    """Solution.snapshot() 목록 -> (item_ids, rotations) 배열"""
+    item_ids = np.array([snap[0] for snap in snapshots], dtype=np.int64)
+    rotations = np.array([list(snap[1]) for snap in snapshots], dtype=np.int64)
+    return item_ids, rotations
+
+
+def random_corpus(sol, count, seed=0, moves_per_layout=5):
+    """sol에서 무작위 이동을 거듭해 만든 배치 count개 (Solution.evaluate() 기준 점수와 함께)"""
+    rng = random.Random(seed)
+    saved_rng, saved = sol.rng, sol.snapshot()
+    sol.rng = rng
+    corpus = []
+    try:
+        for _ in range(count):
+            for _ in range(moves_per_layout):
+                changed = sol.mutate()
+                if changed: sol.update_scores(changed)
+            corpus.append((sol.snapshot(), sol.evaluate()))
+    finally:
+        sol.rng = saved_rng
+        sol.restore(saved)
+    return corpus
+
+
+def check_against_evaluate(sol, count=200, seed=0):
+    """무작위 배치 count개에 대해 BatchEvaluator와 Solution.evaluate()를 비교. 불일치 목록 반환"""
+    corpus = random_corpus(sol, count, seed)
+    item_ids, rotations = snapshots_to_arrays([snap for snap, _ in corpus])
+    scores = BatchEvaluator(sol).evaluate(item_ids, rotations)
+    return [(k, int(scores[k]), ref) for k, (_, ref) in enumerate(corpus) if int(scores[k]) != ref]
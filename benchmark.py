@@ -0,0 +1,188 @@
+# benchmark.py
+# 탐색 핫패스 마이크로 벤치마크 (data.artifacts / data.tablets로 만든 가상 로드아웃)
+# 사용법: python benchmark.py [-o 결과.json] [--compare 이전결과.json] [--quick]
+# 결과 JSON을 리비전끼리 비교해 solver.py 변경의 성능 영향을 숫자로 확인한다.
+import sys
+import copy
+import json
+import time
+import random
+import logging
+import argparse
+import platform
+import subprocess
+
+from data import artifacts, tablets
+from logic_utils import analyze_grid_topology, get_rotated_directions
+from solver import Solution, GRID_WIDTH
+
+# (인벤토리 칸 수, 아이템 수) 조합: 작은 그리드부터 최대 크기까지
+DEFAULT_CASES = [(6, 5), (12, 8), (24, 12), (36, 20), (48, 30), (60, 40), (60, 60)]
+QUICK_CASES = [(12, 8), (36, 20), (60, 40)]
+TABLET_RATIO = 0.4
+
+# 측정 하나에 쓰는 최소 시간(초)과 반복 횟수 (반복 중 가장 빠른 값을 기록)
+MIN_TIME = 0.2
+REPEAT = 3
+
+
+def make_loadout(inv_num, n_items, seed=0, tablet_ratio=TABLET_RATIO):
+    """무작위 로드아웃 (석판은 중복 허용, 아티팩트는 종류별 1개). 같은 seed면 항상 같은 구성"""
+    rng = random.Random(seed)
+    n_items = min(n_items, inv_num)
+    n_tab = int(n_items * tablet_ratio)
+    items = []
+    for _ in range(n_tab):
+        t = copy.deepcopy(rng.choice(tablets))
+        t.quant = 1
+        items.append(t)
+    for a in rng.sample(artifacts, n_items - n_tab):
+        a = copy.deepcopy(a)
+        a.quant = 1
+        a.current_enchant = rng.randint(0, a.max_level)
+        a.priority = rng.random() < 0.2
+        if a.name in ('대립의 천칭', '영원의 식'):
+            a.scale_position = rng.choice(['좌측', '우측'])
+        items.append(a)
+    return items
+
+
+def measure(func, min_time=MIN_TIME, repeat=REPEAT):
+    """func()를 min_time 이상 반복해 1회당 시간을 재고, repeat번 중 가장 빠른 값을 돌려준다"""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 10: break
+        loops *= 10
+    loops = max(1, int(loops * min_time / max(elapsed, 1e-9)))
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return {'ops_per_sec': round(1 / best, 1), 'us_per_op': round(best * 1e6, 3), 'loops': loops}
+
+
+def bench_case(inv_num, n_items, seed=0, min_time=MIN_TIME):
+    items = make_loadout(inv_num, n_items, seed)
+    rows = (inv_num + GRID_WIDTH - 1) // GRID_WIDTH
+    topo_data = analyze_grid_topology(rows, GRID_WIDTH)
+    sol = Solution(inv_num, items, topo_data, random.Random(seed))
+    results = {}
+
+    # 1. 생성자 (전처리 + 탐욕 배치 + 점수 캐시 구성)
+    results['init'] = measure(lambda: Solution(inv_num, items, topo_data, random.Random(seed)), min_time)
+
+    # 2. 전체 채점
+    results['evaluate'] = measure(sol.evaluate, min_time)
+
+    # 3. 이동 + 되돌리기 (채점 제외) / 이동 + 증분 채점 + 되돌리기 (탐색 1회 반복과 같은 작업)
+    def mutate_undo():
+        sol.mutate()
+        sol.undo()
+
+    def move_score_undo():
+        changed = sol.mutate()
+        if changed: sol.update_scores(changed)
+        sol.undo()
+
+    results['mutate'] = measure(mutate_undo, min_time)
+    results['iteration'] = measure(move_score_undo, min_time)
+
+    # 4. 석판 방향 회전 (로드아웃의 석판 x 4회전)
+    directions = [item.directions for item in items if item.item_type == 'Tablet']
+    if directions:
+        def rotate_all():
+            for d in directions:
+                for rot in range(4):
+                    get_rotated_directions(d, rot)
+        r = measure(rotate_all, min_time)
+        r['calls_per_op'] = len(directions) * 4
+        results['get_rotated_directions'] = r
+
+    # 5. 최고 해 저장/복원 비용
+    snap = sol.snapshot()
+    results['snapshot'] = measure(sol.snapshot, min_time)
+    results['restore'] = measure(lambda: sol.restore(snap), min_time)
+
+    return {'inv_num': inv_num, 'n_items': len(items), 'seed': seed,
+            'placed': sum(1 for p in sol.positions if p != -1), 'results': results}
+
+
+def git_revision():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmarks(cases=DEFAULT_CASES, seed=0, min_time=MIN_TIME):
+    report = {
+        'meta': {
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'min_time': min_time,
+            'repeat': REPEAT,
+        },
+        'cases': [],
+    }
+    for inv_num, n_items in cases:
+        case = bench_case(inv_num, n_items, seed, min_time)
+        report['cases'].append(case)
+        line = ', '.join(f"{name} {r['ops_per_sec']:.0f}/s" for name, r in case['results'].items())
+        print(f"[{inv_num}칸/{case['n_items']}개] {line}", file=sys.stderr)
+    return report
+
+
+def compare(old, new):
+    """두 결과에서 같은 (칸 수, 아이템 수, seed) 항목의 ops/sec 비율 출력 (1보다 크면 빨라짐)"""
+    def key(case):
+        return case['inv_num'], case['n_items'], case['seed']
+
+    old_cases = {key(c): c for c in old['cases']}
+    print(f"{old['meta'].get('revision')} -> {new['meta'].get('revision')}", file=sys.stderr)
+    for case in new['cases']:
+        prev = old_cases.get(key(case))
+        if prev is None: continue
+        parts = []
+        for name, r in case['results'].items():
+            if name in prev['results']:
+                parts.append(f"{name} x{r['ops_per_sec'] / prev['results'][name]['ops_per_sec']:.2f}")
+        print(f"[{case['inv_num']}칸/{case['n_items']}개] " + ', '.join(parts), file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='solver 핫패스 마이크로 벤치마크')
+    parser.add_argument('-o', '--output', help='결과 JSON 파일 (없으면 표준 출력)')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON 파일')
+    parser.add_argument('--quick', action='store_true', help='작은 조합만 짧게 측정')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    # 탐욕 배치 경고 등은 측정과 무관하므로 숨긴다
+    logging.getLogger().setLevel(logging.ERROR)
+    cases = QUICK_CASES if args.quick else DEFAULT_CASES
+    report = run_benchmarks(cases, args.seed, MIN_TIME / 4 if args.quick else MIN_TIME)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(json.load(f), report)
+
+
+if __name__ == '__main__':
+    main()
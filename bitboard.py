@@ -0,0 +1,118 @@
+# bitboard.py
+# 가로 6칸 인벤토리 그리드를 정수 비트마스크로 표현
+# 칸 (r, c)는 비트 r * GRID_WIDTH + c 에 대응한다.
+from functools import lru_cache
+
+GRID_WIDTH = 6
+ROW_FULL = (1 << GRID_WIDTH) - 1
+
+
+def cell_bit(r, c):
+    return 1 << (r * GRID_WIDTH + c)
+
+
+def iter_bits(mask):
+    """mask에 켜진 비트의 칸 인덱스를 작은 순서대로"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def free_run_starts(row_bits, length):
+    """한 행(6비트)의 점유 비트에서 length칸 연속으로 빈 구간의 시작 열 목록"""
+    if not 0 < length <= GRID_WIDTH: return []
+    free = ~row_bits & ROW_FULL
+    run = free
+    # run의 c번 비트 = c ~ c+length-1 칸이 모두 비어 있음
+    for k in range(1, length):
+        run &= free >> k
+    return [c for c in range(GRID_WIDTH - length + 1) if run >> c & 1]
+
+
+class GridMasks:
+    """inv_num 크기 그리드의 고정 마스크 모음 (잠긴 칸, 행/열/대각선, 주변 칸)"""
+
+    def __init__(self, inv_num):
+        self.inv_num = inv_num
+        self.grid_height = (inv_num + GRID_WIDTH - 1) // GRID_WIDTH
+        self.size = self.grid_height * GRID_WIDTH
+
+        self.all_mask = (1 << self.size) - 1
+        self.valid_mask = (1 << inv_num) - 1
+        self.locked_mask = self.all_mask & ~self.valid_mask  # inv_num을 넘는 칸
+
+        h = self.grid_height
+        self.row_masks = [ROW_FULL << (r * GRID_WIDTH) for r in range(h)]
+        self.col_masks = [sum(cell_bit(r, c) for r in range(h)) for c in range(GRID_WIDTH)]
+
+        # '/' 대각선은 r + c, '\\' 대각선은 r - c + (GRID_WIDTH - 1)로 구분
+        self.slash_masks = [0] * (h + GRID_WIDTH - 1)
+        self.back_slash_masks = [0] * (h + GRID_WIDTH - 1)
+        for r in range(h):
+            for c in range(GRID_WIDTH):
+                self.slash_masks[r + c] |= cell_bit(r, c)
+                self.back_slash_masks[r - c + GRID_WIDTH - 1] |= cell_bit(r, c)
+
+        # 열마다 가장 아래쪽의 잠기지 않은 칸 (BOTTOM 키워드)
+        self.bottom_mask = 0
+        for c in range(GRID_WIDTH):
+            valid = [r for r in range(h) if r * GRID_WIDTH + c < inv_num]
+            if valid:
+                self.bottom_mask |= cell_bit(valid[-1], c)
+
+        # 주변 8칸 (자기 자신 제외)
+        self.neighbor_masks = []
+        for r in range(h):
+            for c in range(GRID_WIDTH):
+                mask = 0
+                for nr in range(r - 1, r + 2):
+                    for nc in range(c - 1, c + 2):
+                        if (nr, nc) == (r, c): continue
+                        if 0 <= nr < h and 0 <= nc < GRID_WIDTH:
+                            mask |= cell_bit(nr, nc)
+                self.neighbor_masks.append(mask)
+
+    def row_bits(self, mask, r):
+        """mask에서 r행의 6비트만 꺼낸다"""
+        return (mask >> (r * GRID_WIDTH)) & ROW_FULL
+
+    def free_runs(self, blocked, r, length):
+        """r행에서 length칸 연속으로 비어 있는 시작 열 목록 (blocked = 점유 | 잠김)"""
+        return free_run_starts(self.row_bits(blocked, r), length)
+
+    def line_mask(self, key, idx):
+        """idx 칸에 놓인 석판의 키워드 효과(ROW, COL, SLASH, ...)가 닿는 칸. 자기 칸과 잠긴 칸은 제외.
+        TOP = 맨 윗줄, BOTTOM = 열마다 가장 아래 칸, LEFT/RIGHT = 맨 왼쪽/오른쪽 열"""
+        r, c = divmod(idx, GRID_WIDTH)
+        if key == 'ROW':
+            mask = self.row_masks[r]
+        elif key == 'COL':
+            mask = self.col_masks[c]
+        elif key == 'SLASH':
+            mask = self.slash_of(r, c)
+        elif key == 'BACK_SLASH':
+            mask = self.back_slash_of(r, c)
+        elif key == 'TOP':
+            mask = self.row_masks[0]
+        elif key == 'BOTTOM':
+            mask = self.bottom_mask
+        elif key == 'LEFT':
+            mask = self.col_masks[0]
+        elif key == 'RIGHT':
+            mask = self.col_masks[GRID_WIDTH - 1]
+        else:
+            return 0
+        return mask & self.valid_mask & ~(1 << idx)
+
+    def slash_of(self, r, c):
+        return self.slash_masks[r + c]
+
+    def back_slash_of(self, r, c):
+        return self.back_slash_masks[r - c + GRID_WIDTH - 1]
+
+
+@lru_cache(maxsize=None)
+def get_grid_masks(inv_num):
+    """inv_num별 GridMasks (한 번 만들면 재사용)"""
+    return GridMasks(inv_num)
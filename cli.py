@@ -0,0 +1,166 @@
+# cli.py
+# 화면 없이 로드아웃 JSON을 배치하는 명령줄 실행 (Tk/이미지를 쓰지 않음)
+# 사용법: python cli.py loadouts.jsonl [-o results.jsonl] [-j 프로세스 수] [--time 초|auto] [--seed N]
+# 입력: 로드아웃 객체 하나, 로드아웃 배열, 또는 한 줄에 로드아웃 하나인 JSON Lines (형식은 loadout.py 참고)
+# 출력: 로드아웃마다 배치와 점수를 한 줄씩 JSON Lines로 (끝나는 순서대로, 'index'가 입력 순서)
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from loadout import parse_loadout, LoadoutError
+from solver import run_solver, GRID_WIDTH, STRATEGIES
+from annealing import SCHEDULES
+from stopping import auto_time_budget
+
+
+def read_loadouts(text):
+    """입력 텍스트 -> 로드아웃 dict 목록"""
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = [json.loads(line) for line in text.splitlines() if line.strip()]
+    return data if isinstance(data, list) else [data]
+
+
+def layout_rows(sol):
+    """배치를 칸 순서의 JSON용 목록으로"""
+    rows = []
+    for idx, item, rotation in sol.layout():
+        entry = {'cell': idx, 'row': idx // GRID_WIDTH, 'col': idx % GRID_WIDTH,
+                 'name': item.name, 'type': item.item_type}
+        if item.item_type == 'Tablet':
+            entry['rotation'] = rotation
+        else:
+            entry['enchant'] = item.current_enchant
+        rows.append(entry)
+    return rows
+
+
+def check_options(strategy, schedule, workers, stats):
+    """탐색 설정 검사. 잘못되면 LoadoutError (서버는 400으로 응답)"""
+    if not isinstance(strategy, str) or strategy not in STRATEGIES:
+        raise LoadoutError(f"strategy는 {list(STRATEGIES)} 중 하나여야 합니다: {strategy!r}")
+    if not isinstance(schedule, str) or schedule not in SCHEDULES:
+        raise LoadoutError(f"schedule은 {list(SCHEDULES)} 중 하나여야 합니다: {schedule!r}")
+    if not isinstance(workers, int) or isinstance(workers, bool) or workers < 1:
+        raise LoadoutError(f"workers는 1 이상의 정수여야 합니다: {workers!r}")
+    if workers > 1 and stats:
+        raise LoadoutError("workers가 2 이상이면 stats를 쓸 수 없습니다")
+
+
+def solve_loadout(index, data, max_time='auto', strategy='annealing', seed=None, stats=False, max_budget=None,
+                  schedule='geometric', workers=1):
+    """로드아웃 하나를 풀어 결과 dict를 돌려준다 (워커 프로세스에서 실행). 입력 오류는 'error'에 담는다.
+    로드아웃의 max_time/seed/strategy/schedule/workers가 인자보다 우선하며,
+    max_budget이 있으면 시간 제한('auto' 포함)을 그 이하로 자른다."""
+    result = {'index': index, 'id': data.get('id') if isinstance(data, dict) else None}
+    started = time.time()
+    try:
+        inv_num, items = parse_loadout(data)
+        max_time = data.get('max_time', max_time)
+        if max_time != 'auto' and (not isinstance(max_time, (int, float)) or max_time <= 0):
+            raise LoadoutError(f"max_time은 양수 또는 'auto'여야 합니다: {max_time!r}")
+        if max_budget is not None:
+            if max_time == 'auto':
+                max_time = auto_time_budget(len(items), max(0, inv_num - len(items)))
+            max_time = min(max_time, max_budget)
+        strategy = data.get('strategy', strategy)
+        schedule = data.get('schedule', schedule)
+        workers = data.get('workers', workers)
+        check_options(strategy, schedule, workers, stats)
+        sol = run_solver(inv_num, items, max_time=max_time, strategy=strategy, schedule=schedule,
+                         seed=data.get('seed', seed), workers=workers, stats=stats)
+    except LoadoutError as e:
+        result['error'] = str(e)
+        return result
+
+    info = sol.run_info
+    result.update({
+        'inv_num': inv_num,
+        'n_items': len(items),
+        'score': sol.score,
+        'proven_optimal': bool(sol.proven_optimal),
+        'strategy': info.get('strategy'),
+        'iterations': info.get('iterations'),
+        'stop_reason': info.get('stop_reason'),
+        'elapsed': round(time.time() - started, 4),
+        'layout': layout_rows(sol),
+    })
+    if sol.stats is not None:
+        result['stats'] = sol.stats.to_dict()
+    return result
+
+
+def _init_worker(level):
+    logging.getLogger().setLevel(level)
+
+
+def run_batch(loadouts, out, jobs=None, **options):
+    """loadouts를 jobs개 프로세스로 나눠 풀고, 끝나는 대로 out에 한 줄씩 쓴다. 실패한 로드아웃 수를 반환"""
+    jobs = jobs or os.cpu_count() or 1
+    failed = 0
+
+    def emit(result):
+        nonlocal failed
+        if 'error' in result:
+            failed += 1
+            logging.warning(f"로드아웃 {result['index']} ({result['id']}) 실패: {result['error']}")
+        out.write(json.dumps(result, ensure_ascii=False) + '\n')
+        out.flush()
+
+    if jobs == 1:
+        for i, data in enumerate(loadouts):
+            emit(solve_loadout(i, data, **options))
+        return failed
+
+    level = logging.getLogger().level
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(level,)) as pool:
+        futures = {pool.submit(solve_loadout, i, data, **options): i for i, data in enumerate(loadouts)}
+        for future in as_completed(futures):
+            try:
+                emit(future.result())
+            except Exception as e:  # 알고리즘 내부 오류도 배치 전체를 멈추지 않는다
+                emit({'index': futures[future], 'id': None, 'error': f"{type(e).__name__}: {e}"})
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='로드아웃 JSON 일괄 배치 (헤드리스)')
+    parser.add_argument('input', help="로드아웃 JSON / JSON Lines 파일 ('-'면 표준 입력)")
+    parser.add_argument('-o', '--output', help='결과 JSON Lines 파일 (없으면 표준 출력)')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='동시에 돌릴 프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--time', default='auto', help="로드아웃당 시간 제한(초) 또는 'auto'")
+    parser.add_argument('--strategy', default='annealing', choices=list(STRATEGIES))
+    parser.add_argument('--schedule', default='geometric', choices=list(SCHEDULES), help='담금질 냉각 스케줄')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--stats', action='store_true', help='결과에 탐색 계측(solver_stats) 포함')
+    parser.add_argument('-v', '--verbose', action='store_true')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s [%(levelname)s] %(message)s', stream=sys.stderr, force=True)
+    max_time = args.time if args.time == 'auto' else float(args.time)
+
+    if args.input == '-':
+        text = sys.stdin.read()
+    else:
+        with open(args.input, encoding='utf-8') as f:
+            text = f.read()
+    loadouts = read_loadouts(text)
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        failed = run_batch(loadouts, out, args.jobs, max_time=max_time, strategy=args.strategy,
+                           schedule=args.schedule, seed=args.seed, stats=args.stats)
+    finally:
+        if out is not sys.stdout: out.close()
+    logging.info(f"{len(loadouts)}개 중 {len(loadouts) - failed}개 완료")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
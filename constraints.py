@@ -0,0 +1,59 @@
+# constraints.py
+# data.py의 배치 제약(constraint)별로 놓을 수 있는 칸의 비트마스크를 inv_num마다 한 번만 계산
+# 칸 인덱스/비트 규칙은 bitboard.py와 같다 (r * GRID_WIDTH + c).
+from functools import lru_cache
+
+from bitboard import GRID_WIDTH, get_grid_masks, iter_bits
+from logic_utils import constraint_set
+
+# 주변 8칸에 다른 아이템이 없어야 하는 제약 (배치에 따라 달라지므로 마스크가 아니라 이동마다 검사)
+ISOLATED = 'isolated'
+
+# 칸 위치를 제한하지 않는 제약 (점수 규칙이거나 묶음 배치로 처리됨)
+#   harmony: 조화의 수정 점수 / right_spell_book: 모래시계-마법서 H_PAIR 묶음
+#   bridge, top_count: 배치 칸과 무관
+NON_POSITIONAL = {'harmony', 'right_spell_book', 'bridge', 'top_count', ISOLATED}
+
+
+class ConstraintIndex:
+    """제약 이름 -> 놓을 수 있는 칸 마스크"""
+
+    def __init__(self, inv_num):
+        masks = get_grid_masks(inv_num)
+        self.masks = masks
+        valid = masks.valid_mask
+
+        # 가장자리: 상하좌우 중 한 곳이라도 그리드 밖이거나 잠긴 칸인 칸
+        edge = 0
+        for idx in iter_bits(valid):
+            r, c = divmod(idx, GRID_WIDTH)
+            for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                inside = 0 <= nr < masks.grid_height and 0 <= nc < GRID_WIDTH
+                if not inside or not valid >> (nr * GRID_WIDTH + nc) & 1:
+                    edge |= 1 << idx
+                    break
+
+        self.legal = {
+            'top': masks.row_masks[0] & valid,
+            'bottom': masks.bottom_mask,
+            'edge': edge,
+            'inside': valid & ~edge,
+            'left_or_right': (masks.col_masks[0] | masks.col_masks[GRID_WIDTH - 1]) & valid,
+        }
+
+    def legal_mask(self, item):
+        """item의 모든 위치 제약을 만족하는 칸 (모르는 제약은 제한 없음으로 취급)"""
+        mask = self.masks.valid_mask
+        for name in constraint_set(item):
+            mask &= self.legal.get(name, mask)
+        return mask
+
+
+def is_isolated(item):
+    return ISOLATED in constraint_set(item)
+
+
+@lru_cache(maxsize=None)
+def get_constraint_index(inv_num):
+    """inv_num별 ConstraintIndex (한 번 만들면 재사용)"""
+    return ConstraintIndex(inv_num)
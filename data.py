@@ -273,8 +273,7 @@ tablets = [
     Tablet("고양", directions=[(1, 'UNLOCK')], turnable=True, tier='uncommon'),
     Tablet("과거", directions=[(-7, 1), (-6, 1), (-5, 1), (1, 1)], turnable=True, tier='uncommon'),
     Tablet("미래", directions=[(-7, 1), (-6, 1), (-5, 1), (-1, 1)], turnable=True, tier='uncommon'),
-    Tablet("분배", directions=[(-6, 1), (-1, 1), (1, 1), (6, 1)], turnable=False, tier='uncommon'),
-    # 분배는 회전 가능이지만 무의미하기에 Turnable=False 처리
+    Tablet("분배", directions=[(-6, 1), (-1, 1), (1, 1), (6, 1)], turnable=True, tier='uncommon'),
     Tablet("삼두", directions=[(-6, 1), (-1, 1), (1, 1)], turnable=False, tier='uncommon'),
     Tablet("수확", directions=[(-6, 2), (6, 2)], turnable=True, tier='uncommon'),
     Tablet("쌍성", directions=[(-12, 2), (12, 2)], turnable=True, tier='uncommon'),
@@ -290,8 +289,7 @@ tablets = [
     Tablet("준비", directions=[(-7, 1), (7, 1)], turnable=True, tier='uncommon'),
     Tablet("출구", directions=[(5, 1), (6, 2), (7, 1)], turnable=False, tier='uncommon'),
     Tablet("파도", directions=[(-5, 2), (-6, -1), (1, -1)], turnable=True, tier='uncommon'),
-    Tablet("헌정", directions=[(-7, 1), (-5, 1), (5, 1), (7, 1)], turnable=False, tier='uncommon'),
-    # 헌정은 회전 가능이지만 무의미하기에 Turnable=False 처리
+    Tablet("헌정", directions=[(-7, 1), (-5, 1), (5, 1), (7, 1)], turnable=True, tier='uncommon'),
     Tablet("명예", directions=[(-6, 2), (-13, 1)], turnable=True, tier='uncommon'),
     # 희귀 석판 rare
     Tablet("기반", directions=[('ROW', 1)], turnable=False, tier='rare'),
@@ -307,8 +305,7 @@ tablets = [
            , turnable=False, tier='legendary'),
     Tablet("경계", directions=[('TOP', 1), ('BOTTOM', 1)], turnable=False, tier='legendary'),
     Tablet("광휘", directions=[(-6, 2), ('ROW', 1), (6, 2)], turnable=True, tier='legendary'),
-    Tablet("기적", directions=[('ROW', 1), ('COL', 1)], turnable=False, tier='legendary'),
-    # 기적은 회전가능이지만 회전이 무의미하기에 turnable=False로 표시
+    Tablet("기적", directions=[('ROW', 1), ('COL', 1)], turnable=True, tier='legendary'),
     Tablet("백일몽", directions=[(-13, 1), (-11, 1), (-7, 1), (-5, 1), (5, 1), (7, 1), (11, 1), (13, 1)]
            , turnable=True, tier='legendary'),
     Tablet("압축", directions=[(-6, 3), (-12, 2), (-18, 1)], turnable=True, tier='legendary'),
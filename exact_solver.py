@@ -0,0 +1,349 @@
+# exact_solver.py
+# 작은 인벤토리용 완전 탐색 (분기 한정법, Branch and Bound)
+# 칸을 0번부터 순서대로 채우면서, 남은 아이템으로 얻을 수 있는 점수의 상한이
+# 지금까지 찾은 최고 점수 이하인 가지는 잘라낸다.
+import math
+import time
+import logging
+
+from solver import GRID_WIDTH
+from constraints import is_isolated
+
+# 예상 탐색 공간(배치 경우의 수)이 이 값보다 작으면 run_solver가 완전 탐색을 사용
+EXACT_THRESHOLD = 500_000
+
+# 마감 시각 확인 주기 (노드 수)
+CHECK_INTERVAL = 1024
+
+
+class _Timeout(Exception):
+    pass
+
+
+def kind_key(item):
+    """점수 계산상 서로 구별되지 않는 아이템끼리 같은 값 (같은 종류를 중복 탐색하지 않기 위함)"""
+    if item.item_type == 'Tablet':
+        return ('Tablet', item.name, tuple(item.directions), item.turnable)
+    return ('Artifact', item.name, item.current_enchant, bool(item.priority),
+            frozenset(item.constraint), frozenset(item.combo), getattr(item, 'scale_position', None))
+
+
+class _Kind:
+    """같은 종류 아이템 묶음의 사전 계산 정보"""
+
+    def __init__(self, sol, slots):
+        item = sol.items[slots[0]]
+        self.slots = list(slots)  # 이 종류에 속한 아이템 인덱스들
+        self.count = len(slots)
+        self.is_tablet = item.item_type == 'Tablet'
+        self.is_artifact = not self.is_tablet
+        self.harmony = self.is_artifact and item.constraint and 'harmony' in item.constraint
+        self.enchant = item.current_enchant if self.is_artifact else 0
+        self.legal = sol.legal[slots[0]]  # 놓을 수 있는 칸 마스크
+        self.isolated = is_isolated(item)
+        n = sol.inv_num
+
+        # 칸별 버프 배율 (캘세더니 열쇠 행, 대립의 천칭 좌우, 필수 아티팩트 x2)
+        self.mult = [sol.buff_value(item, c // GRID_WIDTH, c % GRID_WIDTH, 1) if self.is_artifact else 0
+                     for c in range(n)]
+        # mult_suffix[i] = max(mult[i:]) (상한 계산용)
+        self.mult_suffix = [0] * (n + 1)
+        for c in reversed(range(n)):
+            self.mult_suffix[c] = max(self.mult[c], self.mult_suffix[c + 1])
+
+        # 석판: 회전별, 칸별로 (대상 칸, 값) 목록
+        self.rots = (0,)
+        self.targets = None
+        self.cap = 0  # 이 석판 하나가 낼 수 있는 양(+)의 효과 합
+        if self.is_tablet:
+            table = sol.tables[slots[0]]
+            self.rots = table.distinct
+            influence = sol.influence[slots[0]]
+            self.targets = {rot: influence[rot] for rot in self.rots}
+            # 칸마다 닿는 대상 수가 다르므로 (키워드 효과는 줄 길이만큼) 모든 칸 중 최대값
+            self.cap = max(sum(max(0, p) for _, p in targets)
+                           for rot in self.rots for targets in influence[rot])
+
+
+class ExactSolver:
+    def __init__(self, sol, deadline, stop_event=None):
+        self.sol = sol
+        self.deadline = deadline
+        self.stop_event = stop_event
+        self.n = sol.inv_num
+        self.nodes = 0
+        self.completed = False
+
+        # 1. 묶음(H_PAIR / H_ROW_GROUP)과 개별 아이템 분리
+        grouped = set()
+        block_members = []
+        for group in sol.groups:
+            if group['type'] in ('H_PAIR', 'H_ROW_GROUP'):
+                members = [sol.item_index[id(it)] for it in group['items']]
+                grouped.update(members)
+                block_members.append(members)
+
+        # 2. 개별 아이템을 종류별로 묶기
+        by_key = {}
+        for i, item in enumerate(sol.items):
+            if i in grouped: continue
+            by_key.setdefault(kind_key(item), []).append(i)
+        self.kinds = [_Kind(sol, slots) for slots in by_key.values()]
+        self.n_single = len(self.kinds)  # 이 앞쪽 종류만 개별로 분기
+
+        # 묶음 구성원은 각각 개수 1짜리 종류로 (묶음 안에서만 배치)
+        self.blocks = []
+        for members in block_members:
+            self.blocks.append([len(self.kinds) + j for j in range(len(members))])
+            for m in members:
+                self.kinds.append(_Kind(sol, [m]))
+        self.block_placed = [False] * len(self.blocks)
+        self.left = [k.count for k in self.kinds]  # 종류별로 아직 안 놓인 개수
+
+        used = sum(k.count for k in self.kinds)
+        self.empties = self.n - used
+
+        # 3. 주변 8칸 (조화의 수정용)
+        self.neighbors = []
+        for c in range(self.n):
+            r0, c0 = divmod(c, GRID_WIDTH)
+            lst = []
+            for nr in range(r0 - 1, r0 + 2):
+                for nc in range(c0 - 1, c0 + 2):
+                    if (nr, nc) == (r0, c0): continue
+                    if 0 <= nr < sol.grid_height and 0 <= nc < GRID_WIDTH and nr * GRID_WIDTH + nc < self.n:
+                        lst.append(nr * GRID_WIDTH + nc)
+            self.neighbors.append(lst)
+
+        # 4. 탐색 상태
+        self.cell_kind = [-1] * self.n
+        self.cell_rot = [0] * self.n
+        self.pending = [0] * self.n  # 이미 놓인 석판이 아직 안 정해진 칸에 주는 값의 합
+        self.harmony_cells = []
+        self.rem_tablet_cap = sum(k.cap * k.count for k in self.kinds if k.is_tablet)
+        self.max_mult_all = max([max(k.mult) for k in self.kinds if k.is_artifact and k.mult] or [0])
+        self.max_enchant_all = max([k.enchant for k in self.kinds if k.is_artifact] or [0])
+
+        # 탐욕 배치가 제약을 어기고 있으면 그 점수를 기준으로 삼지 않는다
+        self.best_score = sol.score if sol.is_legal() else float('-inf')
+        self.best_cells = None
+        self.any_isolated = any(K.isolated for K in self.kinds)
+
+        # 5. 거울 대칭: 개수가 1개인 종류 하나(기준)를 대칭축 한쪽 절반에만 놓아 뒤집힌 배치를 두 번 보지 않는다
+        self.axes = sol.mirror_axes()
+        self.anchor = next((k for k in range(self.n_single) if self.kinds[k].count == 1), -1) if self.axes else -1
+        self.anchor_cells = set()
+        if self.anchor != -1:
+            half_row = (sol.grid_height - 1) // 2
+            for c in range(self.n):
+                r0, c0 = divmod(c, GRID_WIDTH)
+                if ('h' not in self.axes or c0 < GRID_WIDTH // 2) and ('v' not in self.axes or r0 <= half_row):
+                    self.anchor_cells.add(c)
+
+    # ------------------------------------------------------------
+    def allowed(self, k, i):
+        """칸 i에 종류 k를 놓아도 배치 제약(칸 위치, isolated)을 만족하는지 (i 미만만 결정된 상태)"""
+        K = self.kinds[k]
+        if not K.legal >> i & 1: return False
+        if self.any_isolated:
+            cell_kind, kinds = self.cell_kind, self.kinds
+            for h in self.neighbors[i]:
+                if h < i and cell_kind[h] != -1 and (K.isolated or kinds[cell_kind[h]].isolated):
+                    return False
+        return True
+
+    def gain(self, k, rot, i):
+        """칸 i(미만은 모두 결정됨)에 종류 k를 rot으로 놓을 때 확정되는 점수"""
+        K = self.kinds[k]
+        cell_kind, kinds = self.cell_kind, self.kinds
+        d = 0
+        if K.is_artifact:
+            d += self.pending[i] * K.mult[i]
+            for h in self.neighbors[i]:
+                if h < i and cell_kind[h] != -1:
+                    H = kinds[cell_kind[h]]
+                    if H.harmony: d += K.enchant
+                    if K.harmony and H.is_artifact: d += H.enchant
+        else:
+            for t, p in K.targets[rot][i]:
+                if t < i and cell_kind[t] != -1 and kinds[cell_kind[t]].is_artifact:
+                    d += p * kinds[cell_kind[t]].mult[t]
+        return d
+
+    def apply(self, k, rot, i):
+        K = self.kinds[k]
+        self.cell_kind[i] = k
+        self.cell_rot[i] = rot
+        self.left[k] -= 1
+        if K.is_tablet:
+            self.rem_tablet_cap -= K.cap
+            for t, p in K.targets[rot][i]:
+                if t > i: self.pending[t] += p
+        if K.harmony:
+            self.harmony_cells.append(i)
+
+    def revert(self, k, rot, i):
+        K = self.kinds[k]
+        self.cell_kind[i] = -1
+        self.left[k] += 1
+        if K.is_tablet:
+            self.rem_tablet_cap += K.cap
+            for t, p in K.targets[rot][i]:
+                if t > i: self.pending[t] -= p
+        if K.harmony:
+            self.harmony_cells.pop()
+
+    def upper_bound(self, i):
+        """칸 i 이후로 더 얻을 수 있는 점수의 상한 (낙관적 추정)"""
+        rem_mult = 0
+        rem_enchant = 0
+        rem_harmony = 0
+        for k, K in enumerate(self.kinds):
+            if not self.left[k] or not K.is_artifact: continue
+            rem_mult = max(rem_mult, K.mult_suffix[i])
+            rem_enchant = max(rem_enchant, K.enchant)
+            if K.harmony: rem_harmony += self.left[k]
+
+        bound = 0
+        # 이미 놓인 석판 -> 아직 빈 칸: 그 칸에 올 아티팩트의 최대 배율
+        if rem_mult:
+            bound += sum(p for p in self.pending[i:] if p > 0) * rem_mult
+        # 남은 석판: 양(+)의 효과를 모두 최대 배율로 받는다고 가정
+        bound += self.rem_tablet_cap * self.max_mult_all
+        # 조화의 수정: 놓인 것은 남은 이웃 칸 수, 남은 것은 8칸 모두
+        for h in self.harmony_cells:
+            bound += sum(1 for c in self.neighbors[h] if c >= i) * rem_enchant
+        bound += rem_harmony * 8 * self.max_enchant_all
+        return bound
+
+    # ------------------------------------------------------------
+    def search(self):
+        try:
+            self.dfs(0, 0, self.empties)
+            self.completed = True
+        except _Timeout:
+            self.completed = False
+        return self.completed
+
+    def dfs(self, i, score, empties):
+        self.nodes += 1
+        if self.nodes % CHECK_INTERVAL == 0 and time.time() > self.deadline:
+            raise _Timeout()
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise _Timeout()
+
+        units_left = any(self.left)
+        if i >= self.n or not units_left:
+            if not units_left and score > self.best_score:
+                self.best_score = score
+                self.best_cells = (self.cell_kind[:], self.cell_rot[:])
+            return
+
+        if score + self.upper_bound(i) <= self.best_score:
+            return
+
+        # 후보: (확정 이득, 종류 또는 묶음, 회전)
+        options = []
+        for k in range(self.n_single):
+            if not self.left[k]: continue
+            if k == self.anchor and i not in self.anchor_cells: continue
+            if not self.allowed(k, i): continue
+            for rot in self.kinds[k].rots:
+                options.append((self.gain(k, rot, i), 'kind', k, rot))
+        r0, c0 = divmod(i, GRID_WIDTH)
+        for b, members in enumerate(self.blocks):
+            if self.block_placed[b]: continue
+            if c0 + len(members) <= GRID_WIDTH and i + len(members) <= self.n:
+                # 구성원끼리는 서로 붙어 있으므로 isolated 구성원이 있으면 놓을 수 없다
+                if any(self.kinds[m].isolated for m in members) and len(members) > 1: continue
+                if not all(self.allowed(m, i + j) for j, m in enumerate(members)): continue
+                options.append((self.gain(members[0], 0, i), 'block', b, 0))
+        options.sort(key=lambda o: o[0], reverse=True)
+
+        for d, what, k, rot in options:
+            if what == 'kind':
+                self.apply(k, rot, i)
+                self.dfs(i + 1, score + d, empties)
+                self.revert(k, rot, i)
+            else:
+                members = self.blocks[k]
+                self.block_placed[k] = True
+                total = 0
+                for j, m in enumerate(members):
+                    total += self.gain(m, 0, i + j)
+                    self.apply(m, 0, i + j)
+                self.dfs(i + len(members), score + total, empties)
+                for j in reversed(range(len(members))):
+                    self.revert(members[j], 0, i + j)
+                self.block_placed[k] = False
+
+        if empties > 0:
+            self.dfs(i + 1, score, empties - 1)
+
+    # ------------------------------------------------------------
+    def best_snapshot(self):
+        """최고 배치를 Solution.snapshot() 형식으로"""
+        if self.best_cells is None: return None
+        cell_kind, cell_rot = self.best_cells
+        slots = [-1] * self.sol.size
+        rotations = bytearray(self.sol.size)
+        next_instance = [0] * len(self.kinds)
+        for c in range(self.n):
+            k = cell_kind[c]
+            if k == -1: continue
+            slots[c] = self.kinds[k].slots[next_instance[k]]
+            next_instance[k] += 1
+            rotations[c] = cell_rot[c]
+        return slots, bytes(rotations), self.best_score
+
+
+def estimate_search_space(sol):
+    """칸 순서대로 채울 때의 배치 경우의 수 (같은 종류 아이템은 구별하지 않음)"""
+    grouped = set()
+    block_lens = []
+    for group in sol.groups:
+        if group['type'] in ('H_PAIR', 'H_ROW_GROUP'):
+            grouped.update(id(it) for it in group['items'])
+            block_lens.append(len(group['items']))
+
+    counts = {}
+    rot_factor = 1
+    for i, item in enumerate(sol.items):
+        if id(item) in grouped: continue
+        key = kind_key(item)
+        counts[key] = counts.get(key, 0) + 1
+        if sol.tables[i]:
+            rot_factor *= len(sol.tables[i].distinct)
+
+    placed_cells = sum(counts.values()) + sum(block_lens)
+    empties = sol.inv_num - placed_cells
+    if empties < 0: return float('inf')
+    units = sol.inv_num - sum(L - 1 for L in block_lens)  # 묶음은 한 단위로 취급
+
+    log_count = math.lgamma(units + 1) - math.lgamma(empties + 1)
+    for c in counts.values():
+        log_count -= math.lgamma(c + 1)
+    log_count += math.log(rot_factor)
+    # 거울 대칭 (개수 1개인 아이템을 기준으로 절반만 탐색)
+    axes = sol.mirror_axes()
+    if axes and 1 in counts.values():
+        log_count -= len(axes) * math.log(2)
+    return math.exp(min(log_count, 700))
+
+
+def solve_exact(sol, max_time, stop_event=None):
+    """sol(탐욕 배치가 끝난 Solution)을 출발점으로 완전 탐색.
+    제한 시간 안에 끝나면 sol.proven_optimal = True. 더 좋은 배치를 찾으면 sol에 반영한다.
+    stop_event가 설정되면 시간 초과와 같이 그때까지의 최고 배치로 끝낸다."""
+    start = time.time()
+    solver = ExactSolver(sol, start + max_time, stop_event)
+    completed = solver.search()
+    snap = solver.best_snapshot()
+    if snap is not None and (snap[2] > sol.score or not sol.is_legal()):
+        sol.restore(snap)
+    # 제약을 모두 만족하는 배치가 없으면 최적이라고 할 수 없다
+    sol.proven_optimal = completed and sol.is_legal()
+    elapsed = time.time() - start
+    logging.info(f"완전 탐색 {'완료' if completed else '시간 초과'}: 노드 {solver.nodes}개, "
+                 f"{elapsed:.2f}초, 점수 {sol.score}" + (" (최적 증명)" if completed else ""))
+    return solver.nodes, completed, elapsed
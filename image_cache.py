@@ -0,0 +1,181 @@
+# image_cache.py
+# 화면에 필요한 이미지만 그때그때 읽는 지연 로딩 캐시
+# PIL 디코딩/리사이즈는 백그라운드 스레드 풀에서, Tk PhotoImage 생성은 메인 스레드(root.after 폴링)에서 한다.
+# 캐시는 크기 제한이 있는 LRU이며 적중/실패 횟수를 센다.
+import os
+import queue
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+DEFAULT_MAX_ENTRIES = 300
+DEFAULT_WORKERS = 4
+POLL_INTERVAL = 15  # 디코딩이 끝난 이미지를 가져오는 간격 (ms)
+PLACEHOLDER_COLOR = (235, 235, 235, 255)
+
+
+def decode_image(path, size):
+    """파일을 열어 size로 줄인 PIL 이미지 (작업 스레드에서 실행)"""
+    with Image.open(path) as img:
+        img.load()
+        return img.resize(size, Image.Resampling.BILINEAR)
+
+
+class ImageCache:
+    """(경로, 크기) -> PhotoImage LRU 캐시.
+    schedule(ms, func): 메인 스레드에서 func를 나중에 실행 (Tk의 root.after)
+    make_photo(pil_image): 메인 스레드에서 화면용 이미지 생성 (기본 ImageTk.PhotoImage)
+    loader(path, size): 작업 스레드에서 PIL 이미지를 만든다 (기본 decode_image, 썸네일 아틀라스를 쓰면 ThumbnailAtlas.load)"""
+
+    def __init__(self, schedule, make_photo=None, max_entries=DEFAULT_MAX_ENTRIES, workers=DEFAULT_WORKERS,
+                 loader=decode_image):
+        if make_photo is None:
+            from PIL import ImageTk
+            make_photo = ImageTk.PhotoImage
+        self.schedule = schedule
+        self.make_photo = make_photo
+        self.loader = loader
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # 오래 안 쓴 것부터
+        self.waiting = {}             # 디코딩 중인 키 -> 완료 콜백 목록
+        self.done = queue.Queue()     # 작업 스레드 -> 메인 스레드 (키, 디코딩 future)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='image')
+        self.placeholders = {}
+        self.failed = set()           # 디코딩에 실패한 키 (다시 시도하지 않음)
+        self.polling = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, path, size, on_ready=None):
+        """캐시에 있으면 PhotoImage. 없으면 백그라운드 디코딩을 시작하고 자리표시 이미지를 돌려준 뒤,
+        끝나면 on_ready(PhotoImage 또는 None)를 메인 스레드에서 호출. 파일이 없으면 None"""
+        key = (path, size)
+        image = self.entries.get(key)
+        if image is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return image
+        if key in self.failed or not os.path.exists(path):
+            return None
+
+        self.misses += 1
+        callbacks = self.waiting.get(key)
+        if callbacks is None:
+            callbacks = self.waiting[key] = []
+            future = self.pool.submit(self.loader, path, size)
+            future.add_done_callback(lambda f, key=key: self.done.put((key, f)))
+            self._start_polling()
+        if on_ready: callbacks.append(on_ready)
+        return self.placeholder(size)
+
+    def prefetch(self, path, size):
+        """화면에 띄우기 전에 미리 디코딩만 요청"""
+        if (path, size) not in self.entries:
+            self.get(path, size)
+
+    def placeholder(self, size):
+        image = self.placeholders.get(size)
+        if image is None:
+            image = self.placeholders[size] = self.make_photo(Image.new('RGBA', size, PLACEHOLDER_COLOR))
+        return image
+
+    def put(self, key, image):
+        self.entries[key] = image
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def _start_polling(self):
+        if not self.polling:
+            self.polling = True
+            self.schedule(POLL_INTERVAL, self.pump)
+
+    def pump(self):
+        """디코딩이 끝난 이미지를 PhotoImage로 만들어 캐시에 넣고 콜백 호출 (메인 스레드)"""
+        while True:
+            try:
+                key, future = self.done.get_nowait()
+            except queue.Empty:
+                break
+            image = None
+            try:
+                image = self.make_photo(future.result())
+                self.put(key, image)
+            except Exception as e:
+                self.failed.add(key)
+                logging.error(f"[ERROR] {os.path.basename(key[0])} 로드 실패: {e}")
+            for callback in self.waiting.pop(key, []):
+                callback(image)
+
+        self.polling = False
+        if self.waiting:
+            self._start_polling()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {'entries': len(self.entries), 'max_entries': self.max_entries, 'hits': self.hits,
+                'misses': self.misses, 'hit_rate': self.hits / total if total else 0.0,
+                'evictions': self.evictions, 'pending': len(self.waiting)}
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+class SpriteCache:
+    """결과 화면용 (이미지 경로, 크기, 회전) -> 회전까지 적용한 스프라이트. 창/다시 그리기끼리 공유한다.
+    PIL 이미지(합성용)와 PhotoImage(캔버스용)를 각각 크기 제한 LRU로 보관. 메인 스레드에서만 사용"""
+
+    def __init__(self, loader=decode_image, make_photo=None, max_entries=DEFAULT_MAX_ENTRIES):
+        self.loader = loader
+        self.make_photo = make_photo
+        self.max_entries = max_entries
+        self.images = OrderedDict()
+        self.photos = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, entries, key):
+        value = entries.get(key)
+        if value is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+        return value
+
+    def _store(self, entries, key, value):
+        entries[key] = value
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        return value
+
+    def image(self, path, size, rotation=0):
+        """RGBA PIL 이미지. 석판 회전은 시계 방향 90도 단위 (PIL rotate는 반시계 기준이라 음수)"""
+        key = (path, size, rotation)
+        img = self._lookup(self.images, key)
+        if img is None:
+            img = self.loader(path, (size, size)).convert('RGBA')
+            if rotation: img = img.rotate(-90 * rotation)
+            self._store(self.images, key, img)
+        return img
+
+    def photo(self, path, size, rotation=0):
+        key = (path, size, rotation)
+        photo = self._lookup(self.photos, key)
+        if photo is None:
+            if self.make_photo is None:
+                from PIL import ImageTk
+                self.make_photo = ImageTk.PhotoImage
+            photo = self._store(self.photos, key, self.make_photo(self.image(path, size, rotation)))
+        return photo
+
+    def stats(self):
+        return {'images': len(self.images), 'photos': len(self.photos), 'max_entries': self.max_entries,
+                'hits': self.hits, 'misses': self.misses}
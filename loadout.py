@@ -0,0 +1,143 @@
+# loadout.py
+# 로드아웃(인벤토리 칸 수 + 석판 수량 + 아티팩트 인스턴스) -> 알고리즘 입력(개별 아이템 목록)
+# GUI(main.py)와 헤드리스 실행(cli.py)이 같은 규칙으로 인스턴스를 만들도록 여기 모아 둔다. Tk를 쓰지 않는다.
+import copy
+
+from data import artifacts as catalog_artifacts, tablets as catalog_tablets
+
+# UNLOCK 석판으로 제약을 풀 수 없는 아티팩트
+NON_UNLOCKABLE_ARTS = ["빛나는 모래시계", "조화의 수정", "하얀 종이"]
+# 'UNLOCK' 석판으로 하나의 제약만 없애야 할 때
+PARTIAL_UNLOCK_RULES = {
+    "다용도 벨트": {'bottom'}
+}
+POSITION_ARTS = ["대립의 천칭", "영원의 식"]
+KEY_COMBOS = ["견고", "잉걸불", "빙하", "마법공학"]
+
+ARTIFACTS_BY_NAME = {a.name: a for a in catalog_artifacts}
+TABLETS_BY_NAME = {t.name: t for t in catalog_tablets}
+
+
+class LoadoutError(ValueError):
+    """로드아웃 JSON이 잘못됨 (모르는 이름, 범위를 벗어난 값 등)"""
+
+
+def can_unlock(art):
+    return bool(art.constraint) and art.name not in NON_UNLOCKABLE_ARTS
+
+
+def make_artifact_instance(base, enchant=0, priority=False, unlock=False, position=None,
+                           devotion=False, hourglass=False, key_combo=None):
+    """도감의 아티팩트(base)를 복사해 강화/필수/UNLOCK 등 사용자 설정을 적용한 인스턴스"""
+    instance = copy.deepcopy(base)
+    instance.quant = 1
+    instance.current_enchant = min(max(0, enchant), instance.max_level)
+    instance.priority = priority
+
+    if unlock:
+        # 부분 해제 규칙
+        if instance.name in PARTIAL_UNLOCK_RULES:
+            if instance.constraint:
+                instance.constraint -= PARTIAL_UNLOCK_RULES[instance.name]
+        else:
+            instance.constraint = set()
+
+    # 좌우 배치 (천칭, 영원의 식 공용)
+    if position:
+        instance.scale_position = position
+    if devotion:
+        instance.apply_devotion = True
+    if hourglass:
+        instance.apply_hourglass = True
+    if key_combo:
+        instance.combo = {key_combo}
+    return instance
+
+
+def flatten_items(tablets, artifacts):
+    """알고리즘 엔진은 '수량(quant)' 개념을 모르고 개별 객체로 다룬다.
+    아티팩트는 이미 개별 인스턴스, 석판은 quant만큼 복제 (서로 다른 회전값을 가질 수 있게 깊은 복사)"""
+    flat_items = list(artifacts)
+    for tab in tablets:
+        for _ in range(tab.quant):
+            new_tab = copy.deepcopy(tab)
+            new_tab.quant = 1
+            flat_items.append(new_tab)
+    return flat_items
+
+
+# ==========================================
+# [JSON 로드아웃]
+# ==========================================
+# {
+#   "id": "예시",                  (선택) 결과에 그대로 붙는 식별자
+#   "inv_num": 36,
+#   "tablets": {"차양": 2, "선의": 1},
+#   "artifacts": [
+#     {"name": "가시덤불", "enchant": 3, "priority": true, "unlock": false},
+#     {"name": "대립의 천칭", "position": "우측"},
+#     {"name": "캘세더니 열쇠", "key_combo": "빙하"},
+#     {"name": "빛나는 모래시계", "hourglass": true}, ...
+#   ]
+# }
+def parse_artifact(entry):
+    if isinstance(entry, str):
+        entry = {'name': entry}
+    name = entry.get('name')
+    base = ARTIFACTS_BY_NAME.get(name)
+    if base is None:
+        raise LoadoutError(f"알 수 없는 아티팩트: {name!r}")
+
+    enchant = entry.get('enchant', 0)
+    if not isinstance(enchant, int) or not 0 <= enchant <= base.max_level:
+        raise LoadoutError(f"[{name}] 강화 수치는 0~{base.max_level} 정수여야 합니다: {enchant!r}")
+    unlock = bool(entry.get('unlock', False))
+    if unlock and not can_unlock(base):
+        raise LoadoutError(f"[{name}] UNLOCK으로 풀 수 있는 제약이 없습니다")
+    position = entry.get('position')
+    if position is not None and (name not in POSITION_ARTS or position not in ("좌측", "우측")):
+        raise LoadoutError(f"[{name}] position은 {POSITION_ARTS}에만 '좌측'/'우측'으로 지정합니다")
+    if name in POSITION_ARTS and position is None:
+        position = "좌측"  # GUI 기본값
+    devotion = bool(entry.get('devotion', False))
+    if devotion and not base.is_unit:
+        raise LoadoutError(f"[{name}] 동료 소환 아티팩트가 아니어서 devotion을 쓸 수 없습니다")
+    hourglass = bool(entry.get('hourglass', False))
+    if hourglass and not base.is_spell:
+        raise LoadoutError(f"[{name}] 마법서가 아니어서 hourglass를 쓸 수 없습니다")
+    key_combo = entry.get('key_combo')
+    if name == "캘세더니 열쇠":
+        key_combo = key_combo or KEY_COMBOS[0]
+        if key_combo not in KEY_COMBOS:
+            raise LoadoutError(f"[{name}] key_combo는 {KEY_COMBOS} 중 하나입니다: {key_combo!r}")
+    elif key_combo is not None:
+        raise LoadoutError(f"[{name}] key_combo는 캘세더니 열쇠에만 지정합니다")
+
+    return make_artifact_instance(base, enchant, bool(entry.get('priority', False)), unlock,
+                                  position, devotion, hourglass, key_combo)
+
+
+def parse_loadout(data):
+    """JSON 로드아웃(dict) -> (inv_num, 개별 아이템 목록)"""
+    if not isinstance(data, dict):
+        raise LoadoutError("로드아웃은 JSON 객체여야 합니다")
+    inv_num = data.get('inv_num')
+    if not isinstance(inv_num, int) or inv_num <= 0:
+        raise LoadoutError(f"inv_num은 양의 정수여야 합니다: {inv_num!r}")
+
+    tablets = []
+    for name, quant in (data.get('tablets') or {}).items():
+        base = TABLETS_BY_NAME.get(name)
+        if base is None:
+            raise LoadoutError(f"알 수 없는 석판: {name!r}")
+        if not isinstance(quant, int) or quant < 0:
+            raise LoadoutError(f"[{name}] 석판 수량은 0 이상의 정수여야 합니다: {quant!r}")
+        tab = copy.deepcopy(base)
+        tab.quant = quant
+        tablets.append(tab)
+
+    artifacts = [parse_artifact(entry) for entry in data.get('artifacts') or []]
+    flat_items = flatten_items(tablets, artifacts)
+    if len(flat_items) > inv_num:
+        raise LoadoutError(f"아이템 개수({len(flat_items)})가 인벤토리 칸 수({inv_num})보다 많습니다")
+    return inv_num, flat_items
@@ -1,5 +1,9 @@
 # logic_utils.py
+import json
 import logging
+from collections import namedtuple
+
+from bitboard import get_grid_masks, iter_bits
 
 GRID_WIDTH = 6
 
@@ -53,6 +57,174 @@ def get_rotated_directions(directions, rotation_count=0):
         new_dirs = temp
     return new_dirs
 
+# [석판 회전 테이블]
+# 회전별로 좌표 변화량(dx, dy, 값)과 키워드 효과(키워드, 값)를 미리 풀어 둔 불변 테이블.
+# variants[k]가 k번 회전한 결과이고, distinct는 실제로 시도할 가치가 있는 회전 목록이다
+# (회전 불가 석판은 (0,), 효과가 같은 회전은 가장 작은 값 하나만 남김 - 분배/헌정/기적처럼 대칭인 석판은
+# 회전 가능으로 두어도 (0,), 악수/쌍성처럼 180도 대칭이면 (0, 1)).
+# canonical[k]는 k번 회전과 효과가 같은 distinct 안의 회전 (없으면 distinct[0]).
+TabletRotation = namedtuple('TabletRotation', ['offsets', 'keywords'])
+RotationTable = namedtuple('RotationTable', ['name', 'variants', 'distinct', 'canonical'])
+
+_ROTATION_TABLES = {}
+
+
+def variant_key(variant):
+    """효과 순서는 의미가 없으므로 정렬한 묶음으로 비교 (값에 'UNLOCK' 문자열이 섞여 repr로 정렬)"""
+    return tuple(sorted(variant.offsets, key=repr)), tuple(sorted(variant.keywords, key=repr))
+
+
+def compile_rotation_table(name, directions, turnable):
+    """석판 방향 리스트 -> RotationTable"""
+    variants = []
+    for rot in range(4):
+        dirs = get_rotated_directions(directions, rot)
+        offsets = tuple((k[0], k[1], v) for k, v in dirs if isinstance(k, tuple))
+        keywords = tuple((k, v) for k, v in dirs if isinstance(k, str))
+        variants.append(TabletRotation(offsets, keywords))
+
+    distinct = []
+    rep = {}  # 효과 -> 대표 회전
+    for rot in (range(4) if turnable else [0]):
+        key = variant_key(variants[rot])
+        if key in rep: continue
+        rep[key] = rot
+        distinct.append(rot)
+    canonical = tuple(rep.get(variant_key(variants[rot]), distinct[0]) for rot in range(4))
+
+    return RotationTable(name, tuple(variants), tuple(distinct), canonical)
+
+
+# [거울 대칭]
+# 'h' = 좌우 반전 (c -> 5 - c), 'v' = 상하 반전 (r -> 높이 - 1 - r)
+_MIRROR_KEYWORDS = {
+    'h': {'SLASH': 'BACK_SLASH', 'BACK_SLASH': 'SLASH', 'LEFT': 'RIGHT', 'RIGHT': 'LEFT'},
+    'v': {'SLASH': 'BACK_SLASH', 'BACK_SLASH': 'SLASH', 'TOP': 'BOTTOM', 'BOTTOM': 'TOP'},
+}
+
+
+def mirror_variant(variant, axis):
+    """회전 결과 하나를 거울에 비춘 결과"""
+    if axis == 'h':
+        offsets = tuple((-dx, dy, v) for dx, dy, v in variant.offsets)
+    else:
+        offsets = tuple((dx, -dy, v) for dx, dy, v in variant.offsets)
+    keywords = tuple((_MIRROR_KEYWORDS[axis].get(k, k), v) for k, v in variant.keywords)
+    return TabletRotation(offsets, keywords)
+
+
+def is_mirror_closed(table, axis):
+    """시도 가능한 모든 회전의 거울상이 다시 시도 가능한 회전 중 하나인지 (석판이 거울 대칭을 깨지 않는지)"""
+    allowed = {variant_key(table.variants[rot]) for rot in table.distinct}
+    return all(variant_key(mirror_variant(table.variants[rot], axis)) in allowed for rot in table.distinct)
+
+
+def get_rotation_table(tablet):
+    """석판의 회전 테이블 (한 번 컴파일한 뒤 캐시에서 재사용)"""
+    key = (tablet.name, tuple(tablet.directions), tablet.turnable)
+    table = _ROTATION_TABLES.get(key)
+    if table is None:
+        table = compile_rotation_table(tablet.name, tablet.directions, tablet.turnable)
+        _ROTATION_TABLES[key] = table
+    return table
+
+
+# [석판 영향 테이블]
+# 그리드 크기(inv_num)별로 "칸 c에 rot번 회전해 놓인 석판이 버프하는 (대상 칸, 값)" 목록을 미리 풀어 둔다.
+# 좌표 효과와 키워드 효과(ROW, COL, SLASH, TOP, ...)를 모두 풀어 넣으며,
+# 그리드 밖/잠긴 칸을 가리키는 효과는 제외, 정수가 아닌 값('UNLOCK' 등)은 1로 환산.
+_INFLUENCE_TABLES = {}
+
+
+def compile_influence(inv_num, table, width=6):
+    """RotationTable -> influence[rot][cell] = ((대상 칸, 값), ...)"""
+    masks = get_grid_masks(inv_num)
+    per_rot = []
+    for variant in table.variants:
+        per_cell = []
+        for cell in range(inv_num):
+            r, c = divmod(cell, width)
+            targets = []
+            for dx, dy, v in variant.offsets:
+                tr, tc = r + dy, c + dx
+                if tr >= 0 and 0 <= tc < width and tr * width + tc < inv_num:
+                    targets.append((tr * width + tc, v if isinstance(v, int) else 1))
+            for key, v in variant.keywords:
+                w = v if isinstance(v, int) else 1
+                targets.extend((t, w) for t in iter_bits(masks.line_mask(key, cell)))
+            per_cell.append(tuple(targets))
+        per_rot.append(tuple(per_cell))
+    return tuple(per_rot)
+
+
+def get_influence_table(inv_num, table):
+    """(inv_num, 석판) 영향 테이블 (그리드 크기별로 한 번만 만들고 재사용)"""
+    key = (inv_num, table)
+    influence = _INFLUENCE_TABLES.get(key)
+    if influence is None:
+        influence = compile_influence(inv_num, table)
+        _INFLUENCE_TABLES[key] = influence
+    return influence
+
+
+# [칸별 회전 후보]
+# 서로 다른 회전이라도 그리드 가장자리/잠긴 칸에서 잘려 나가면 특정 칸에서는 버프하는 (대상 칸, 값)이 같을 수 있다.
+# cell_rotations[cell] = (그 칸에서 효과가 서로 다른 회전들, 회전 0~3 -> 효과가 같은 대표 회전)
+_CELL_ROTATIONS = {}
+
+
+def get_cell_rotations(inv_num, table):
+    """(inv_num, 석판) 칸별 회전 후보 (table.distinct 중 그 칸에서 효과가 다른 것만). 영향 테이블처럼 캐시해 재사용"""
+    key = (inv_num, table)
+    cell_rotations = _CELL_ROTATIONS.get(key)
+    if cell_rotations is None:
+        influence = get_influence_table(inv_num, table)
+        cell_rotations = []
+        for cell in range(inv_num):
+            rep = {}  # 효과 -> 대표 회전
+            for rot in table.distinct:
+                rep.setdefault(tuple(sorted(influence[rot][cell])), rot)
+            canonical = tuple(rep[tuple(sorted(influence[table.canonical[rot]][cell]))] for rot in range(4))
+            cell_rotations.append((tuple(rep.values()), canonical))
+        cell_rotations = _CELL_ROTATIONS[key] = tuple(cell_rotations)
+    return cell_rotations
+
+
+def compile_tablets(tablets):
+    """석판 목록 전체를 미리 컴파일. {이름: RotationTable} 반환"""
+    tables = {t.name: get_rotation_table(t) for t in tablets}
+    logging.debug(f"석판 회전 테이블 컴파일: {len(tables)}종")
+    return tables
+
+
+# [아이템 서명]
+# 배치/점수에 영향을 주는 속성만 모은 값. 서명이 같은 아이템 인스턴스는 서로 바꿔 놓아도 결과가 같다.
+# (결과 캐시의 키, 이전 배치를 새 아이템 목록에 옮길 때의 짝짓기에 사용)
+def item_signature(item):
+    """점수/배치 제약에 영향을 주는 속성만 모은 JSON 호환 서명"""
+    if item.item_type == 'Tablet':
+        return ['T', item.name, repr(item.directions), bool(item.turnable), repr(item.constraint)]
+    return ['A', item.name, item.current_enchant, bool(item.priority),
+            sorted(item.constraint or ()),
+            getattr(item, 'scale_position', None) or '',
+            bool(getattr(item, 'apply_devotion', False)),
+            bool(getattr(item, 'apply_hourglass', False)),
+            sorted(item.combo or ())]
+
+
+def constraint_set(item):
+    """아이템 제약을 집합으로 (석판은 문자열 하나, 아티팩트는 set으로 저장되어 있음)"""
+    c = item.constraint
+    if not c: return frozenset()
+    if isinstance(c, str): return frozenset((c,))
+    return frozenset(c)
+
+
+def signature_text(item):
+    """item_signature를 비교/해시용 문자열로"""
+    return json.dumps(item_signature(item), ensure_ascii=False, separators=(',', ':'))
+
+
 def analyze_grid_topology(rows, cols):
     """
     그리드의 각 칸이 가진 지형적 특성(가로/세로/대각선 길이 등)을 미리 계산
@@ -5,12 +5,18 @@ import tkinter.font
 import ctypes
 import os
 import logging
-import copy  # 객체 복사를 위해 필요
-from PIL import Image, ImageTk
+import time
+import queue
+import threading
+from PIL import Image, ImageTk, ImageDraw
 # 모듈화
 from models import Artifact, Tablet
 from data import artifacts, tablets
 from solver import run_solver
+from solution_cache import SolutionCache
+from loadout import make_artifact_instance, flatten_items, can_unlock
+from image_cache import ImageCache, SpriteCache
+from thumbnails import ThumbnailAtlas, resolve_image
 
 # 로깅 설정
 logging.basicConfig(
@@ -28,6 +34,8 @@ logging.info("===프로그램 시작===")
 base_dir = os.path.dirname(os.path.abspath(__file__))
 image_dir = os.path.join(base_dir, "tablets_images")
 art_image_dir = os.path.join(base_dir, "artifacts_images")
+# 같은 로드아웃을 다시 배치할 때 쓰는 결과 캐시
+SOLUTION_CACHE = SolutionCache(os.path.join(base_dir, "solution_cache.json"))
 
 try:
     ctypes.windll.shcore.SetProcessDpiAwareness(1)
@@ -36,6 +44,7 @@ except Exception:
 
 # 전역 변수
 USER_INV_NUM = 0
+LAST_SOLUTION = None  # 직전 배치 결과 (입력을 조금 바꿔 다시 배치할 때 이어서 탐색)
 all_frames = {}
 root = Tk()
 root.title("sephiria inventorier")
@@ -59,44 +68,44 @@ BTN_STYLE = {
 }
 
 # [이미지 캐싱]
-IMAGE_CACHE = {}
-
-
-def load_cached_image(file_name, directory, size):
-    full_path = os.path.join(directory, file_name)
-    key = (full_path, size)
-    if key in IMAGE_CACHE: return IMAGE_CACHE[key]
-    if os.path.exists(full_path):
-        try:
-            pil_image = Image.open(full_path)
-            pil_image = pil_image.resize(size, Image.Resampling.BILINEAR)
-            tk_image = ImageTk.PhotoImage(pil_image)
-            IMAGE_CACHE[key] = tk_image
-            return tk_image
-        except Exception as e:
-            logging.error(f"[ERROR] {file_name} 로드 실패: {e}")
-            return None
-    return None
-
-
-def preload_all_images():
-    logging.info("=== 리소스 프리로딩 시작 ===")
+# 시작할 때 전부 읽지 않고, 화면에 필요한 이미지만 백그라운드 스레드에서 가져온다 (크기 제한 LRU)
+# 크기별로 미리 줄여 둔 썸네일 아틀라스(thumb_cache/)가 있으면 원본 PNG 대신 거기서 잘라 쓴다.
+THUMBNAILS = ThumbnailAtlas(os.path.join(base_dir, "thumb_cache"), {'tablets': image_dir, 'artifacts': art_image_dir})
+IMAGE_CACHE = ImageCache(root.after, loader=THUMBNAILS.load)
+# 결과 화면용 (이미지, 크기, 회전)별 스프라이트 (모든 결과 창/다시 그리기가 공유)
+SPRITES = SpriteCache(loader=THUMBNAILS.load)
+
+
+def load_cached_image(name, directory, size, on_ready=None):
+    """캐시에 있으면 PhotoImage, 디코딩 중이면 자리표시 이미지(끝나면 on_ready(PhotoImage) 호출), 파일이 없으면 None
+    name은 확장자를 뺀 아이템/조합 이름 (.PNG/.png는 resolve_image가 찾는다)"""
+    path = resolve_image(directory, name)
+    if path is None: return None
+    return IMAGE_CACHE.get(path, size, on_ready)
+
+
+def set_lazy_image(widget, name, directory, size):
+    """widget(Label/Button)에 이미지를 붙인다. 로딩 중에는 자리표시를 보여 주고 끝나면 바꿔 끼운다.
+    이미지 파일이 없으면 False"""
+    def ready(tk_image):
+        if tk_image and widget.winfo_exists():
+            widget.configure(image=tk_image)
+            widget.image = tk_image
+
+    tk_image = load_cached_image(name, directory, size, ready)
+    if tk_image is None: return False
+    widget.configure(image=tk_image)
+    widget.image = tk_image  # 참조 유지
+    return True
+
+
+def prefetch_images():
+    """썸네일 아틀라스 확인(필요하면 재생성)을 백그라운드에서 시작하고,
+    첫 화면(석판 입력)에 쓰일 이미지만 미리 디코딩 요청 (기다리지 않음)"""
+    threading.Thread(target=THUMBNAILS.ensure, daemon=True).start()
     for t in tablets:
-        load_cached_image(f"{t.name}.PNG", image_dir, (50, 50))
-    for a in artifacts:
-        load_cached_image(f"{a.name}.PNG", art_image_dir, (50, 50))
-        # 세부 설정창용 작은 이미지도 미리 로드
-        load_cached_image(f"{a.name}.PNG", art_image_dir, (40, 40))
-
-    all_combos = set()
-    for a in artifacts:
-        if a.combo:
-            all_combos.update(a.combo)
-        else:
-            all_combos.add('무속성')
-    for combo in list(all_combos):
-        load_cached_image(f"{combo}.png", art_image_dir, (20, 20))
-    logging.info("=== 프리로딩 완료 ===")
+        path = resolve_image(image_dir, t.name)
+        if path: IMAGE_CACHE.prefetch(path, (50, 50))
 
 
 # [검증 함수]
@@ -233,12 +242,9 @@ def get_input_tablet():
             col_base = col_group * 4
             pad_x_img = (40, 5) if col_group > 0 else 5
 
-            file_name = f"{tablet.name}.PNG"
-            tk_image = load_cached_image(file_name, image_dir, (50, 50))
+            label_img = Label(center_frame, bg=BG_COLOR)
 
-            if tk_image:
-                label_img = Label(center_frame, image=tk_image, bg=BG_COLOR)
-                label_img.image = tk_image
+            if set_lazy_image(label_img, tablet.name, image_dir, (50, 50)):
                 label_img.grid(row=row_idx, column=col_base, sticky='w', padx=pad_x_img, pady=2)
             else:
                 Label(center_frame, text="[No Img]", bg=BG_COLOR).grid(row=row_idx, column=col_base, padx=pad_x_img)
@@ -399,13 +405,10 @@ def get_input_artifact():
             col_base = col_group * 4
             pad_x_img = (40, 5) if col_group > 0 else 5
 
-            file_name = f"{artifact.name}.PNG"
-            tk_image = load_cached_image(file_name, art_image_dir, (50, 50))
+            label_img = Label(center_frame, bg=BG_COLOR)
 
             # 이미지
-            if tk_image:
-                label_img = Label(center_frame, image=tk_image, bg=BG_COLOR)
-                label_img.image = tk_image
+            if set_lazy_image(label_img, artifact.name, art_image_dir, (50, 50)):
                 label_img.grid(row=row_idx, column=col_base, sticky='w', padx=pad_x_img, pady=2)
             else:
                 Label(center_frame, text="[Img X]", bg=BG_COLOR).grid(row=row_idx, column=col_base, padx=pad_x_img)
@@ -443,10 +446,10 @@ def get_input_artifact():
     if s_combos:
         sp = (len(s_combos) + 1) // 2
         for i, c in enumerate(s_combos):
-            icon = load_cached_image(f"{c}.png", art_image_dir, (20, 20))
-            b = Button(bc, text=f"  {c}" if icon else c, image=icon, compound="left",
+            b = Button(bc, text=c, compound="left",
                        command=lambda x=c: print_combo_page(x), anchor="w", width=140, height=23, padx=10, **BTN_STYLE)
-            if icon: b.image = icon
+            if set_lazy_image(b, c, art_image_dir, (20, 20)):
+                b.configure(text=f"  {c}")
             b.grid(row=i % sp, column=i // sp, padx=5, pady=2)
 
     def next_click():
@@ -659,8 +662,6 @@ def get_artifact_details():
     # -----------------------------------------------------------
     # [리스트 생성 루프]
     # -----------------------------------------------------------
-    # 알고리즘용 constraint를 가진 아티팩트 목록('UNLOCK' 석판으로 해제 불가능한)
-    NON_UNLOCKABLE_ARTS = ["빛나는 모래시계", "조화의 수정", "하얀 종이"]
     for art in artifacts:
         if art.quant > 0:
             for i in range(art.quant):
@@ -671,9 +672,8 @@ def get_artifact_details():
                     row_f.grid_columnconfigure(col_idx, minsize=width)
 
                 # 1~5 기본 컬럼
-                tk_img = load_cached_image(f"{art.name}.PNG", art_image_dir, (40, 40))
-                l = Label(row_f, image=tk_img, bg=BG_COLOR)
-                l.image = tk_img
+                l = Label(row_f, bg=BG_COLOR)
+                set_lazy_image(l, art.name, art_image_dir, (40, 40))
                 l.grid(row=0, column=0)
 
                 name_str = art.name + (f" #{i + 1}" if art.quant > 1 else "")
@@ -692,7 +692,7 @@ def get_artifact_details():
                             command=calculate_realtime).grid(row=0, column=3)
 
                 var_unlock = None
-                if art.constraint and art.name not in NON_UNLOCKABLE_ARTS:
+                if can_unlock(art):  # 'UNLOCK' 석판으로 해제 가능한 constraint가 있는 아티팩트만
                     var_unlock = BooleanVar(value=False)
                     Checkbutton(row_f, variable=var_unlock, bg=BG_COLOR, activebackground=BG_COLOR,
                                 command=calculate_realtime).grid(row=0, column=4)
@@ -752,52 +752,31 @@ def get_artifact_details():
                 })
 
     def validate_and_start():
-        # 'UNLOCK' 석판으로 하나의 제약만 없애야 할 때
-        PARTIAL_UNLOCK_RULES = {
-            "다용도 벨트": {'bottom'}
-        }
         final_instances = []
         required_points = 0
         unlocks_used = 0
         hourglass_used = 0
 
         for item in instance_widgets:
-            base = item['base_art']
-            instance = copy.deepcopy(base)
-            instance.quant = 1
-
             val_str = item['enchant_ent'].get()
-            cur_enc = int(val_str) if val_str.isdigit() else 0
-            if cur_enc > instance.max_level: cur_enc = instance.max_level
-            instance.current_enchant = cur_enc
-            instance.priority = item['priority_var'].get()
+            unlock = bool(item['unlock_var'] and item['unlock_var'].get())
+            hourglass = bool(item.get('hourglass_var') and item['hourglass_var'].get())
+            # 인스턴스 생성 규칙(부분 해제 등)은 loadout.py와 공유
+            instance = make_artifact_instance(
+                item['base_art'],
+                enchant=int(val_str) if val_str.isdigit() else 0,
+                priority=item['priority_var'].get(),
+                unlock=unlock,
+                position=item['scale_cb'].get() if item['scale_cb'] else None,  # 천칭, 영원의 식 공용
+                devotion=bool(item['devotion_var'] and item['devotion_var'].get()),
+                hourglass=hourglass,
+                key_combo=item['key_cb'].get() if item.get('key_cb') else None,
+            )
 
             if instance.priority:
                 required_points += max(0, instance.max_level - instance.current_enchant)
-
-            if item['unlock_var'] and item['unlock_var'].get():
-                unlocks_used += 1
-                # 부분 해제 규칙
-                if instance.name in PARTIAL_UNLOCK_RULES:
-                    if instance.constraint:
-                        instance.constraint -= PARTIAL_UNLOCK_RULES[instance.name]
-                else:
-                    instance.constraint = set()
-
-            # 좌우 배치 저장 (천칭, 영원의 식 공용)
-            if item['scale_cb']:
-                instance.scale_position = item['scale_cb'].get()
-
-            if item['devotion_var'] and item['devotion_var'].get():
-                instance.apply_devotion = True
-
-            if item.get('hourglass_var') and item['hourglass_var'].get():
-                hourglass_used += 1
-                instance.apply_hourglass = True
-
-            if item.get('key_cb'):
-                selected_combo = item['key_cb'].get()
-                instance.combo = {selected_combo}
+            if unlock: unlocks_used += 1
+            if hourglass: hourglass_used += 1
 
             final_instances.append(instance)
 
@@ -826,23 +805,10 @@ def get_artifact_details():
 # ==========================================
 def arrangement(inv_num, tablets, artifacts):
     logging.info(f"--- 배치 알고리즘 시작 ---")
+    logging.debug(f"이미지 캐시: {IMAGE_CACHE.stats()}, 스프라이트: {SPRITES.stats()}")
 
-    # 1. 데이터 평탄화 (Flatten)
-    # 알고리즘 엔진은 '수량(quant)' 개념을 모르고 개별 객체로 다룹니다.
-    flat_items = []
-
-    # 아티팩트: 이미 개별 인스턴스로 쪼개져서 넘어옴
-    for art in artifacts:
-        flat_items.append(art)
-
-    # 석판: 'quant' 수량만큼 복제해서 리스트에 넣어야 함
-    for tab in tablets:
-        if tab.quant > 0:
-            for _ in range(tab.quant):
-                # 깊은 복사를 해야 서로 다른 회전값을 가질 수 있음
-                new_tab = copy.deepcopy(tab)
-                new_tab.quant = 1  # 개별 객체이므로 1로 설정
-                flat_items.append(new_tab)
+    # 1. 데이터 평탄화 (Flatten): 석판은 quant 수량만큼 개별 객체로 복제 (loadout.flatten_items)
+    flat_items = flatten_items(tablets, artifacts)
 
     logging.info(f"배치할 총 아이템 수: {len(flat_items)}")
 
@@ -850,135 +816,282 @@ def arrangement(inv_num, tablets, artifacts):
         messagebox.showerror("오류", f"아이템 개수({len(flat_items)})가 인벤토리 칸 수({inv_num})보다 많습니다!")
         return
 
-    # 2. 로딩 창 띄우기 (계산하는 동안 사용자가 알 수 있게)
-    loading_win = Toplevel(root)
-    loading_win.title("계산 중...")
-    set_center_window(loading_win, 300, 100)
-    Label(loading_win, text="최적의 배치를 찾는 중입니다...\n잠시만 기다려주세요.", pady=20).pack()
-    loading_win.update()  # 화면 갱신 강제 수행
-
-    # 3. Solver 실행 (3초간 계산)
-    # 여기서 solver.py의 run_solver가 호출됩니다.
-    try:
-        best_solution = run_solver(inv_num, flat_items, max_time=3)
-    except Exception as e:
-        loading_win.destroy()
-        logging.error(f"알고리즘 에러: {e}")
-        messagebox.showerror("에러", f"배치 중 오류가 발생했습니다:\n{e}")
+    # 같은 로드아웃의 저장된 결과가 있으면 바로 보여준다 (최적 증명된 결과면 탐색 생략)
+    cached = SOLUTION_CACHE.get(inv_num, flat_items)
+    if cached and cached.proven_optimal:
+        show_result_window(cached)
         return
 
-    loading_win.destroy()
+    # 2. 결과 창을 먼저 띄우고, 탐색은 작업 스레드에서 돌린다.
+    # 작업 스레드는 Tk를 직접 건드리지 않고 큐에 메시지만 넣으며, 메인 스레드가 root.after로 꺼내 그린다.
+    stop_event = threading.Event()
+    messages = queue.Queue()
+    view = ResultView((inv_num + 5) // 6, on_accept=stop_event.set, on_cancel=stop_event.set)
+    last_sent = [0.0]
+    if cached:
+        # 저장된 배치를 먼저 보여주고, 뒤에서 계속 더 좋은 배치를 찾는다
+        view.draw(cached.grid)
+        view.set_status(f"저장된 배치 (점수: {cached.score}) - 개선 중...")
+
+    def on_improve(sol, snap, elapsed):  # 작업 스레드에서 호출됨
+        now = time.time()
+        if now - last_sent[0] >= REDRAW_INTERVAL:
+            messages.put(('improve', sol.grid_of(snap), snap[2], elapsed))
+            last_sent[0] = now
+
+    # 3. Solver 실행 (문제 크기에 맞춘 시간 제한, 담금질 기법)
+    # 저장된 배치나 직전 결과가 있으면 그 배치에서 이어서 탐색 (추가/삭제된 아이템은 solver가 보정)
+    # 여기서 solver.py의 run_solver가 호출됩니다.
+    seed_layout = cached or LAST_SOLUTION
 
-    # 4. 결과 화면 보여주기
-    show_result_window(best_solution)
+    def solve():
+        try:
+            best_solution = run_solver(inv_num, flat_items, max_time='auto', strategy='annealing',
+                                       on_improve=on_improve, stop_event=stop_event, seed_layout=seed_layout,
+                                       stats=True)
+            messages.put(('done', best_solution))
+        except Exception as e:
+            messages.put(('error', e))
+
+    threading.Thread(target=solve, daemon=True).start()
+
+    # 4. 진행 상황 / 최종 결과 표시
+    def poll():
+        global LAST_SOLUTION
+        latest = None
+        while True:
+            try:
+                msg = messages.get_nowait()
+            except queue.Empty:
+                break
+            if msg[0] == 'improve':
+                latest = msg
+            elif msg[0] == 'error':
+                view.close()
+                logging.error(f"알고리즘 에러: {msg[1]}")
+                messagebox.showerror("에러", f"배치 중 오류가 발생했습니다:\n{msg[1]}")
+                return
+            else:
+                best_solution = msg[1]
+                if best_solution.stats:
+                    logging.debug(f"탐색 보고서: {best_solution.stats.to_json()}")
+                if not view.alive:
+                    # 취소(창 닫기)된 탐색 결과는 버린다: 캐시에 저장하지도, 다음 탐색의 출발점으로 쓰지도 않음
+                    logging.info("배치 취소됨")
+                    return
+                if cached and cached.score >= best_solution.score:
+                    best_solution = cached
+                SOLUTION_CACHE.put(best_solution)
+                LAST_SOLUTION = best_solution
+                view.show_final(best_solution)
+                return
+
+        if latest and cached and latest[2] <= cached.score:
+            latest = None  # 저장된 배치보다 나아질 때까지는 저장된 배치를 계속 보여준다
+        if latest and view.alive:
+            _, grid, score, elapsed = latest
+            view.draw(grid)
+            view.set_status(f"배치 중... (점수: {score}, {elapsed:.1f}초)")
+        root.after(POLL_INTERVAL, poll)
+
+    root.after(POLL_INTERVAL, poll)
 
 
 # ==========================================
 # [결과 화면 표시 (이미지 & 회전 & 인벤 제한 적용)]
 # ==========================================
-def show_result_window(solution):
-    """계산된 Grid를 시각적으로 보여주는 창"""
-    res_win = Toplevel(root)
-
-    # 점수 표시
-    res_win.title(f"배치 결과 (점수: {solution.score})")
-    set_center_window(res_win, 600, 750)
-
-    # 캔버스 생성
-    canvas = Canvas(res_win, bg="white")
-    canvas.pack(fill="both", expand=True)
-
-    # 이미지 참조 유지용 리스트 (가비지 컬렉션 방지)
-    canvas.image_refs = []
-
-    CELL_SIZE = 70  # 이미지 잘 보이게 칸 키움
-    IMG_SIZE = 60  # 안에 들어갈 이미지 크기
-    MARGIN = 20
-
-    grid = solution.grid
-    rows = len(grid)
-    cols = len(grid[0])
+COMPOSITE_RESULT = True  # 결과 그리드를 이미지 한 장으로 합성해 그림 (False면 칸마다 캔버스 아이템)
+REDRAW_INTERVAL = 0.15  # 탐색 중 결과 화면 다시 그리기 최소 간격 (초)
+POLL_INTERVAL = 50  # 작업 스레드 메시지 확인 간격 (ms)
+
+CELL_SIZE = 70  # 이미지 잘 보이게 칸 키움
+IMG_SIZE = 60  # 안에 들어갈 이미지 크기
+MARGIN = 20
+
+
+class ResultView:
+    """배치 결과 창. 탐색 중에는 최고 배치를 갱신해 보여주고 '현재 배치로 확정' / '취소' 버튼을 제공한다."""
+
+    def __init__(self, rows, on_accept=None, on_cancel=None):
+        self.win = Toplevel(root)
+        self.win.title("배치 중...")
+        self.alive = True
+        self.on_cancel = on_cancel
+        self.win.protocol("WM_DELETE_WINDOW", self.close)
+
+        # 캔버스 크기 자동 조절
+        can_w = MARGIN * 2 + 6 * CELL_SIZE
+        can_h = MARGIN * 2 + rows * CELL_SIZE
+        set_center_window(self.win, can_w, can_h + 60)
+
+        # 캔버스 생성
+        self.canvas = Canvas(self.win, bg="white")
+        self.canvas.pack(fill="both", expand=True)
+        # 이미지 참조 유지용 리스트 (가비지 컬렉션 방지)
+        self.canvas.image_refs = []
+
+        bf = Frame(self.win)
+        bf.pack(side='bottom', pady=10)
+        self.search_btns = []
+        if on_accept:
+            def accept():
+                self.set_status("확정 중...")
+                on_accept()
+            self.search_btns.append(Button(bf, text="현재 배치로 확정", command=accept, **BTN_STYLE))
+        if on_cancel:
+            self.search_btns.append(Button(bf, text="취소", command=self.close, **BTN_STYLE))
+        self.close_btn = Button(bf, text="닫기", command=self.close, **BTN_STYLE)
+        for btn in self.search_btns or [self.close_btn]:
+            btn.pack(side='left', padx=10)
+
+    def set_status(self, text):
+        self.win.title(text)
+
+    def close(self):
+        # 탐색 중에 창을 닫거나 취소하면 탐색도 멈추고 결과는 버린다
+        if self.on_cancel: self.on_cancel()
+        if self.alive:
+            self.alive = False
+            self.win.destroy()
+
+    def show_final(self, solution):
+        self.draw(solution.grid)
+        self.set_status(f"배치 결과 (점수: {solution.score})")
+        self.on_cancel = None
+        if self.search_btns:
+            for btn in self.search_btns:
+                btn.destroy()
+            self.search_btns = []
+            self.close_btn.pack(side='left', padx=10)
+
+    def draw(self, grid):
+        """2차원 그리드 보기(Solution.grid / grid_of)를 캔버스에 다시 그린다"""
+        canvas = self.canvas
+        canvas.delete("all")
+        canvas.image_refs = []
+        draw_grid(canvas, grid)
+
+
+def cell_color(item):
+    """칸 배경색 (구분감)"""
+    if item.name == "빛나는 모래시계": return "#FFF9C4"
+    if item.name == "헌신의 휘장": return "#FFCCBC"
+    return "#E0F7FA" if item.item_type == 'Artifact' else "#FFF3E0"
+
+
+def grid_cells(grid):
+    """칸마다 (x1, y1, x2, y2, 잠긴 칸 여부, 칸 내용)"""
+    for r in range(len(grid)):
+        for c in range(len(grid[0])):
+            x1 = MARGIN + c * CELL_SIZE
+            y1 = MARGIN + r * CELL_SIZE
+            # 인벤토리 칸 수 초과 시 '잠긴 칸'
+            yield x1, y1, x1 + CELL_SIZE, y1 + CELL_SIZE, r * 6 + c >= USER_INV_NUM, grid[r][c]
+
+
+def sprite_of(item, rot):
+    """아이템 이미지 경로와 회전 (석판만 회전, 이미지가 없으면 경로 None)"""
+    target_dir = art_image_dir if item.item_type == 'Artifact' else image_dir
+    return resolve_image(target_dir, item.name), rot if item.item_type == 'Tablet' else 0
+
+
+def draw_grid(canvas, grid, composite=None):
+    """결과 그리드를 캔버스에 그린다. composite면 칸/이미지를 PIL 이미지 한 장으로 합성해 한 번에 올린다.
+    이미지는 (아이템 이미지, 크기, 회전)별로 SPRITES에서 공유"""
+    if composite is None: composite = COMPOSITE_RESULT
+    if composite:
+        image, texts = compose_grid(grid)
+        tk_img = ImageTk.PhotoImage(image)
+        canvas.create_image(0, 0, image=tk_img, anchor='nw')
+        canvas.image_refs.append(tk_img)  # 참조 유지
+        for x, y, text, font, color in texts:
+            canvas.create_text(x, y, text=text, font=font, fill=color)
+        return
 
-    # 캔버스 크기 자동 조절
-    can_w = MARGIN * 2 + cols * CELL_SIZE
-    can_h = MARGIN * 2 + rows * CELL_SIZE
-    res_win.geometry(f"{can_w}x{can_h + 60}")
+    for x1, y1, x2, y2, locked, cell in grid_cells(grid):
+        if locked:
+            # 빗금 친 회색 칸 그리기
+            canvas.create_rectangle(x1, y1, x2, y2, fill="#404040", outline="gray")
+            canvas.create_line(x1, y1, x2, y2, fill="#606060", width=2)
+            canvas.create_line(x1, y2, x2, y1, fill="#606060", width=2)
+            continue  # 아이템 그리지 않음
+
+        # 정상 칸 테두리
+        canvas.create_rectangle(x1, y1, x2, y2, outline="lightgray")
+        if not cell: continue
+        item, rot = cell['item'], cell['rotation']  # 0, 1, 2, 3
+        center_x, center_y = (x1 + x2) // 2, (y1 + y2) // 2
+        canvas.create_rectangle(x1 + 2, y1 + 2, x2 - 2, y2 - 2, fill=cell_color(item), outline="")
 
-    for r in range(rows):
-        for c in range(cols):
-            # 현재 칸의 인덱스 (0부터 시작)
-            cell_idx = r * 6 + c
+        try:
+            path, sprite_rot = sprite_of(item, rot)
+            if path:
+                tk_img = SPRITES.photo(path, IMG_SIZE, sprite_rot)
+                canvas.create_image(center_x, center_y, image=tk_img)
+                canvas.image_refs.append(tk_img)  # 캐시에서 밀려나도 화면에 남도록 참조 유지
+            else:
+                # 이미지가 없으면 텍스트로 대체
+                canvas.create_text(center_x, center_y, text=item.name[:4], font=(FONT_NAME, 8))
+        except Exception as e:
+            logging.error(f"이미지 처리 중 오류: {e}")
+            canvas.create_text(center_x, center_y, text="Err", font=(FONT_NAME, 8))
+
+        # 디버깅용: 텍스트로 회전값 작게 표시 (선택사항)
+        if rot > 0:
+            canvas.create_text(x2 - 10, y2 - 10, text=f"R{rot}", font=("Arial", 7), fill="red")
+
+
+def compose_grid(grid):
+    """칸 배경/잠긴 칸/아이템 이미지를 PIL 이미지 한 장으로 합성.
+    한글 글꼴은 PIL에서 쓰기 어려우므로 글자는 (x, y, 글자, 글꼴, 색) 목록으로 따로 돌려준다"""
+    width = MARGIN * 2 + len(grid[0]) * CELL_SIZE
+    height = MARGIN * 2 + len(grid) * CELL_SIZE
+    image = Image.new('RGBA', (width, height), "white")
+    draw = ImageDraw.Draw(image)
+    texts = []
+
+    for x1, y1, x2, y2, locked, cell in grid_cells(grid):
+        # PIL 사각형은 끝 좌표를 포함하므로 캔버스와 맞추려고 1씩 줄인다
+        if locked:
+            draw.rectangle((x1, y1, x2 - 1, y2 - 1), fill="#404040", outline="gray")
+            draw.line((x1, y1, x2, y2), fill="#606060", width=2)
+            draw.line((x1, y2, x2, y1), fill="#606060", width=2)
+            continue
+
+        draw.rectangle((x1, y1, x2 - 1, y2 - 1), outline="lightgray")
+        if not cell: continue
+        item, rot = cell['item'], cell['rotation']
+        center_x, center_y = (x1 + x2) // 2, (y1 + y2) // 2
+        draw.rectangle((x1 + 2, y1 + 2, x2 - 3, y2 - 3), fill=cell_color(item))
 
-            x1 = MARGIN + c * CELL_SIZE
-            y1 = MARGIN + r * CELL_SIZE
-            x2 = x1 + CELL_SIZE
-            y2 = y1 + CELL_SIZE
-            center_x = (x1 + x2) // 2
-            center_y = (y1 + y2) // 2
-
-            # [Req 2] 인벤토리 칸 수 초과 시 '잠긴 칸' 처리
-            if cell_idx >= USER_INV_NUM:
-                # 빗금 친 회색 칸 그리기
-                canvas.create_rectangle(x1, y1, x2, y2, fill="#404040", outline="gray")
-                canvas.create_line(x1, y1, x2, y2, fill="#606060", width=2)
-                canvas.create_line(x1, y2, x2, y1, fill="#606060", width=2)
-                continue  # 아이템 그리지 않음
-
-            # 정상 칸 테두리
-            canvas.create_rectangle(x1, y1, x2, y2, outline="lightgray")
-
-            cell = grid[r][c]
-            if cell:
-                item = cell['item']
-                rot = cell['rotation']  # 0, 1, 2, 3
-
-                # 배경색 (구분감)
-                bg_col = "#E0F7FA" if item.item_type == 'Artifact' else "#FFF3E0"
-                if item.name == "빛나는 모래시계": bg_col = "#FFF9C4"
-                if item.name == "헌신의 휘장": bg_col = "#FFCCBC"
-
-                canvas.create_rectangle(x1 + 2, y1 + 2, x2 - 2, y2 - 2, fill=bg_col, outline="")
-
-                # [Req 1, 3] 이미지 로드 및 회전 처리
-                # 기존 캐시된 PhotoImage는 회전이 안 되므로, PIL로 새로 엽니다.
-                try:
-                    target_dir = art_image_dir if item.item_type == 'Artifact' else image_dir
-                    img_path = os.path.join(target_dir, f"{item.name}.PNG")
-
-                    if os.path.exists(img_path):
-                        pil_img = Image.open(img_path)
-                        pil_img = pil_img.resize((IMG_SIZE, IMG_SIZE), Image.Resampling.BILINEAR)
-
-                        # 석판이면 회전 적용 (PIL rotate는 시계반대방향이 기준이라 음수 사용)
-                        # 1(90도) -> -90
-                        if item.item_type == 'Tablet' and rot > 0:
-                            pil_img = pil_img.rotate(-90 * rot)
-
-                        tk_img = ImageTk.PhotoImage(pil_img)
-
-                        # 캔버스에 그리기
-                        canvas.create_image(center_x, center_y, image=tk_img)
-                        canvas.image_refs.append(tk_img)  # 참조 유지
-                    else:
-                        # 이미지가 없으면 텍스트로 대체
-                        canvas.create_text(center_x, center_y, text=item.name[:4], font=(FONT_NAME, 8))
+        try:
+            path, sprite_rot = sprite_of(item, rot)
+            if path:
+                sprite = SPRITES.image(path, IMG_SIZE, sprite_rot)
+                offset = (center_x - IMG_SIZE // 2, center_y - IMG_SIZE // 2)
+                image.alpha_composite(sprite, offset)
+            else:
+                texts.append((center_x, center_y, item.name[:4], (FONT_NAME, 8), "black"))
+        except Exception as e:
+            logging.error(f"이미지 처리 중 오류: {e}")
+            texts.append((center_x, center_y, "Err", (FONT_NAME, 8), "black"))
 
-                except Exception as e:
-                    logging.error(f"이미지 처리 중 오류: {e}")
-                    canvas.create_text(center_x, center_y, text="Err", font=(FONT_NAME, 8))
+        if rot > 0:
+            texts.append((x2 - 10, y2 - 10, f"R{rot}", ("Arial", 7), "red"))
+    return image, texts
 
-                # 디버깅용: 텍스트로 회전값 작게 표시 (선택사항)
-                if rot > 0:
-                    canvas.create_text(x2-10, y2-10, text=f"R{rot}", font=("Arial", 7), fill="red")
 
-    # 닫기 버튼
-    Button(res_win, text="닫기", command=res_win.destroy, **BTN_STYLE).pack(side='bottom', pady=10)
+def show_result_window(solution):
+    """계산된 Grid를 시각적으로 보여주는 창"""
+    view = ResultView(solution.grid_height)
+    view.show_final(solution)
+    return view
 
 
 # [실행부]
 set_center_window(root, 1024, 768)
 root.resizable(True, True)
-preload_all_images()
+prefetch_images()
 get_input_inventory()
 get_input_tablet()
 show_frame("inv")
@@ -0,0 +1,145 @@
+# portfolio.py
+# 여러 프로세스에서 독립 탐색을 동시에 돌리고 가장 좋은 해를 고르는 병렬 모드
+import os
+import time
+import random
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from logic_utils import analyze_grid_topology
+from bitboard import get_grid_masks
+from solver import Solution, run_solver, GRID_WIDTH
+from stopping import STOP_TIME, STOP_REQUESTED
+
+# 워커마다 돌아가며 배정하는 기본 전략 조합 (전략, 냉각 스케줄)
+DEFAULT_STRATEGIES = [
+    ('annealing', 'geometric'),
+    ('annealing', 'reheat'),
+    ('hill_climb', None),
+    ('annealing', 'linear'),
+]
+
+# 결과 수집/프로세스 정리에 남겨 두는 시간 (초)
+COLLECT_MARGIN = 0.15
+# stop_event 확인 간격 (초)
+CANCEL_POLL = 0.05
+
+# 워커 프로세스 안에서 공유하는 사전 계산 데이터와 중단 신호 (multiprocessing.Event)
+_worker_topo = None
+_worker_cancel = None
+
+
+def _init_worker(inv_num, topo_data, cancel=None):
+    """워커 시작 시 1회: 지형 정보와 그리드 마스크를 준비 (석판 회전 테이블은 solver import 때 컴파일됨)"""
+    global _worker_topo, _worker_cancel
+    _worker_topo = topo_data
+    _worker_cancel = cancel
+    get_grid_masks(inv_num)
+
+
+def _solve_worker(worker_id, inv_num, items, call_start, deadline, strategy, schedule, seed, seed_layout=None,
+                  exact=False, debug=False):
+    """워커 1개의 탐색. 무거운 Solution 대신 배치 벡터와 요약만 돌려준다."""
+    started = time.time()
+    budget = max(0.0, deadline - started)
+    sol = run_solver(inv_num, items, max_time=budget, debug=debug, strategy=strategy,
+                     schedule=schedule or 'geometric', seed=seed, topo_data=_worker_topo, exact=exact,
+                     stop_event=_worker_cancel, seed_layout=seed_layout)
+    report = dict(sol.run_info)
+    report.update({'worker': worker_id, 'pid': os.getpid(), 'score': sol.score,
+                   'startup': started - call_start})
+    return sol.snapshot(), report
+
+
+def _normalize_strategies(strategies):
+    result = []
+    for entry in strategies or DEFAULT_STRATEGIES:
+        if isinstance(entry, str):
+            entry = (entry, 'geometric' if entry == 'annealing' else None)
+        result.append(tuple(entry))
+    return result
+
+
+def run_portfolio(inv_num, flat_items, max_time=3, workers=None, strategies=None, seed=None, seed_layout=None,
+                  stop_event=None, exact='auto', debug=False):
+    """workers개의 프로세스에서 서로 다른 시드/전략으로 탐색해 가장 좋은 Solution 반환.
+    seed_layout이 있으면 모든 워커가 그 배치에서 이어서 탐색한다.
+    stop_event가 설정되면 모든 워커에 중단을 알리고 그때까지의 최고 해를 모은다 (stop_reason 'stopped').
+    exact(True/'auto')로 완전 탐색을 쓰게 되면 워커 없이 이 프로세스에서 한 번만 푼다.
+    반환된 Solution.worker_reports에 워커별 점수/반복 수/최고 해 여부가 담긴다."""
+    call_start = time.time()
+    workers = workers or os.cpu_count() or 1
+    plans = _normalize_strategies(strategies)
+    base_seed = seed if seed is not None else random.randrange(1 << 30)
+    if isinstance(seed_layout, Solution):
+        seed_layout = seed_layout.layout()
+
+    rows = (inv_num + GRID_WIDTH - 1) // GRID_WIDTH
+    topo_data = analyze_grid_topology(rows, GRID_WIDTH)
+    if exact is not False:
+        # 완전 탐색은 결정적이라 워커마다 돌릴 필요가 없다: 여기서 한 번 정해 이 프로세스에서 풀거나 워커에서는 끈다
+        from exact_solver import estimate_search_space, EXACT_THRESHOLD
+        space = estimate_search_space(Solution(inv_num, flat_items, topo_data, seed_layout=seed_layout))
+        if exact is True or (exact == 'auto' and space < EXACT_THRESHOLD):
+            return run_solver(inv_num, flat_items, max_time=max_time, debug=debug, seed=seed, topo_data=topo_data,
+                              exact=True, stop_event=stop_event, seed_layout=seed_layout)
+    # 모든 워커가 같은 절대 시각에 끝나도록 마감 시각을 넘긴다 (프로세스 기동 시간 포함)
+    deadline = call_start + max_time - COLLECT_MARGIN
+
+    # 스레드용 stop_event는 다른 프로세스에서 볼 수 없으므로 워커에는 프로세스 간 Event로 전달
+    cancel = multiprocessing.Event()
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(inv_num, topo_data, cancel))
+    try:
+        futures = []
+        for i in range(workers):
+            strategy, schedule = plans[i % len(plans)]
+            futures.append(executor.submit(_solve_worker, i, inv_num, flat_items, call_start, deadline,
+                                           strategy, schedule, base_seed + i, seed_layout, exact, debug))
+        end = call_start + max_time
+        not_done = set(futures)
+        while not_done:
+            remaining = end - time.time()
+            if remaining <= 0: break
+            _, not_done = wait(not_done, timeout=min(remaining, CANCEL_POLL))
+            if stop_event is not None and stop_event.is_set() and not cancel.is_set():
+                cancel.set()  # 워커는 다음 반복 전에 멈추고 최고 해를 돌려준다
+                end = min(end, time.time() + COLLECT_MARGIN)
+        done = [f for f in futures if f not in not_done]
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    results = []
+    for f in done:
+        try:
+            results.append(f.result())
+        except Exception as e:
+            logging.error(f"포트폴리오 워커 실패: {e}")
+    if not_done:
+        logging.warning(f"포트폴리오: 제한 시간 안에 끝나지 않은 워커 {len(not_done)}개는 제외")
+
+    sol = Solution(inv_num, flat_items, topo_data)
+    reports = sorted((r for _, r in results), key=lambda r: r['worker'])
+    if results:
+        best_snap, best_report = max(results, key=lambda x: x[0][2])
+        sol.restore(best_snap)
+        for r in reports:
+            r['best'] = r is best_report
+
+    for r in reports:
+        logging.info(f"[워커 {r['worker']}] {r['strategy']}/{r['schedule']} 시드 {r['seed']}: "
+                     f"점수 {r['score']}, {r['iterations']}회 반복, 기동 {r['startup']:.2f}초"
+                     + (" <- 최고" if r['best'] else ""))
+
+    sol.worker_reports = reports
+    if cancel.is_set():
+        reason = STOP_REQUESTED
+    elif results:
+        reason = best_report.get('stop_reason', STOP_TIME)
+    else:
+        reason = STOP_TIME
+    sol.run_info = {'strategy': 'portfolio', 'workers': workers, 'seed': base_seed,
+                    'iterations': sum(r['iterations'] for r in reports),
+                    'elapsed': time.time() - call_start, 'stop_reason': reason}
+    return sol
@@ -0,0 +1,211 @@
+# server.py
+# 같은 PC의 다른 도구에서 배치 알고리즘을 부르는 로컬 HTTP/JSON 서비스
+# 워커 프로세스가 도감(data)과 그리드별 사전 계산(마스크, 석판 영향 테이블, 제약 인덱스)을 미리 올려 두고 재사용한다.
+# 사용법: python server.py [--port 8765] [--workers N] [--queue 32] [--max-budget 10]
+#   POST /solve   로드아웃 JSON (형식은 loadout.py, 선택 키: max_time, seed, strategy, schedule, workers)
+#                 -> 결과 JSON (cli.py와 같은 형식). 잘못된 로드아웃/설정은 400
+#   GET  /stats   처리량/지연 시간 통계
+#   GET  /health  상태 확인
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from cli import solve_loadout
+
+DEFAULT_PORT = 8765
+DEFAULT_QUEUE = 32          # 실행 중인 것 외에 기다릴 수 있는 요청 수 (넘으면 503)
+DEFAULT_MAX_BUDGET = 10.0   # 요청 하나의 최대 탐색 시간 (초)
+LATENCY_WINDOW = 1000       # 지연 시간 백분위를 계산할 최근 요청 수
+WARM_GRID_SIZES = range(1, 61)
+
+
+def _warm_worker(grid_sizes):
+    """워커 시작 시 1회: 그리드 크기별 마스크/제약 인덱스/석판 영향 테이블을 미리 만든다"""
+    from solver import ROTATION_TABLES
+    from bitboard import get_grid_masks
+    from constraints import get_constraint_index
+    from logic_utils import get_influence_table
+    logging.getLogger().setLevel(logging.WARNING)
+    for inv_num in grid_sizes:
+        get_grid_masks(inv_num)
+        get_constraint_index(inv_num)
+        for table in ROTATION_TABLES.values():
+            get_influence_table(inv_num, table)
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values: return None
+    return round(sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))], 4)
+
+
+class QueueFull(Exception):
+    """대기열이 가득 참 (HTTP 503)"""
+
+
+class SolverService:
+    """요청 대기열 + 프로세스 풀. HTTP 없이 solve()를 직접 불러도 된다."""
+
+    def __init__(self, workers=None, queue_size=DEFAULT_QUEUE, max_budget=DEFAULT_MAX_BUDGET,
+                 grid_sizes=WARM_GRID_SIZES):
+        self.workers = workers or os.cpu_count() or 1
+        self.capacity = self.workers + queue_size  # 실행 중 + 대기 중 최대 개수
+        self.max_budget = max_budget
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker,
+                                        initargs=(list(grid_sizes),))
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.started = time.time()
+        self.counters = {'requests': 0, 'completed': 0, 'failed': 0, 'rejected': 0}
+        self.latencies = deque(maxlen=LATENCY_WINDOW)    # 접수~응답 (대기 포함)
+        self.solve_times = deque(maxlen=LATENCY_WINDOW)  # 워커 안의 풀이 시간
+
+    def solve(self, data):
+        """로드아웃 하나를 풀어 결과 dict 반환 (입력 오류는 결과의 'error'). 대기열이 가득 차면 QueueFull"""
+        with self.lock:
+            self.counters['requests'] += 1
+            if self.pending >= self.capacity:
+                self.counters['rejected'] += 1
+                raise QueueFull(f"대기열이 가득 찼습니다 ({self.pending}/{self.capacity})")
+            index = self.counters['requests']
+            self.pending += 1
+
+        received = time.time()
+        try:
+            future = self.pool.submit(solve_loadout, index, data, max_budget=self.max_budget)
+            result = future.result()
+        except Exception:
+            with self.lock:
+                self.counters['failed'] += 1
+            raise
+        finally:
+            with self.lock:
+                self.pending -= 1
+
+        latency = time.time() - received
+        with self.lock:
+            self.counters['failed' if 'error' in result else 'completed'] += 1
+            self.latencies.append(latency)
+            if 'elapsed' in result: self.solve_times.append(result['elapsed'])
+        result['latency'] = round(latency, 4)
+        return result
+
+    def stats(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+            solve_times = sorted(self.solve_times)
+            counters = dict(self.counters)
+            pending = self.pending
+        uptime = time.time() - self.started
+
+        def summary(values):
+            return {'mean': round(sum(values) / len(values), 4) if values else None,
+                    'p50': _percentile(values, 0.5), 'p95': _percentile(values, 0.95),
+                    'max': round(values[-1], 4) if values else None}
+
+        return {
+            **counters,
+            'in_flight': min(pending, self.workers),
+            'queued': max(0, pending - self.workers),
+            'workers': self.workers,
+            'capacity': self.capacity,
+            'max_budget': self.max_budget,
+            'uptime': round(uptime, 3),
+            'throughput': round(counters['completed'] / uptime, 4) if uptime > 0 else 0.0,  # 완료 건/초
+            'latency': summary(latencies),
+            'solve_time': summary(solve_times),
+        }
+
+    def close(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+
+class SolverRequestHandler(BaseHTTPRequestHandler):
+    server_version = 'SephiriaSolver/1.0'
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/stats':
+            self.send_json(200, self.server.service.stats())
+        elif self.path == '/health':
+            self.send_json(200, {'status': 'ok'})
+        else:
+            self.send_json(404, {'error': f"없는 경로: {self.path}"})
+
+    def do_POST(self):
+        if self.path != '/solve':
+            self.send_json(404, {'error': f"없는 경로: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            data = json.loads(self.rfile.read(length).decode('utf-8'))
+            if not isinstance(data, dict): raise ValueError("로드아웃은 JSON 객체여야 합니다")
+        except ValueError as e:
+            self.send_json(400, {'error': f"잘못된 요청 본문: {e}"})
+            return
+
+        try:
+            result = self.server.service.solve(data)
+        except QueueFull as e:
+            self.send_json(503, {'error': str(e)}, {'Retry-After': '1'})
+            return
+        except Exception as e:
+            logging.exception("배치 요청 처리 실패")
+            self.send_json(500, {'error': f"{type(e).__name__}: {e}"})
+            return
+        self.send_json(400 if 'error' in result else 200, result)
+
+    def log_message(self, format, *args):
+        logging.debug(f"{self.address_string()} {format % args}")
+
+
+def make_server(service, host='127.0.0.1', port=DEFAULT_PORT):
+    """service를 감싼 HTTP 서버 (port=0이면 빈 포트를 골라 server.server_address로 알려 준다)"""
+    server = ThreadingHTTPServer((host, port), SolverRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='배치 알고리즘 로컬 HTTP 서비스')
+    parser.add_argument('--host', default='127.0.0.1', help='기본값은 이 PC에서만 접속 가능')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('-j', '--workers', type=int, default=None, help='워커 프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--queue', type=int, default=DEFAULT_QUEUE, help='대기열 크기')
+    parser.add_argument('--max-budget', type=float, default=DEFAULT_MAX_BUDGET, help='요청당 최대 탐색 시간 (초)')
+    parser.add_argument('-v', '--verbose', action='store_true')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(asctime)s [%(levelname)s] %(message)s', stream=sys.stderr, force=True)
+    service = SolverService(args.workers, args.queue, args.max_budget)
+    server = make_server(service, args.host, args.port)
+    host, port = server.server_address[:2]
+    logging.info(f"배치 서비스 시작: http://{host}:{port} (워커 {service.workers}개, 대기열 {args.queue})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == '__main__':
+    main()
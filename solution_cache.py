@@ -0,0 +1,141 @@
+# solution_cache.py
+# 같은 로드아웃(인벤토리 칸 수 + 아이템 구성)으로 다시 배치할 때 저장해 둔 결과를 바로 돌려주는 디스크 캐시
+# 키: 아이템 인스턴스의 점수 관련 속성만 모은 정규화 서명의 해시 (입력 순서 무관)
+# 값: 칸별 (아이템 서명, 회전) 배치와 점수. 파일 하나(JSON)에 LRU 순서로 최대 max_entries개 보관.
+import os
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+from logic_utils import analyze_grid_topology, signature_text
+from solver import Solution, GRID_WIDTH
+
+# 점수 계산 방식이 바뀌면 올려서 이전 캐시를 무효화
+CACHE_VERSION = 2
+DEFAULT_MAX_ENTRIES = 200
+
+
+def loadout_key(inv_num, items):
+    """inv_num + 아이템 서명 목록(정렬)의 SHA-256"""
+    sigs = sorted(signature_text(item) for item in items)
+    payload = json.dumps([CACHE_VERSION, inv_num, sigs], ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SolutionCache:
+    """로드아웃 -> 배치 캐시. get/put은 여러 스레드에서 불러도 된다."""
+
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # 오래 안 쓴 것부터
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path): return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != CACHE_VERSION: return
+            self.entries = OrderedDict((e['key'], e) for e in data.get('entries', []))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logging.warning(f"배치 캐시 파일을 읽지 못해 비웁니다: {e}")
+            self.entries = OrderedDict()
+
+    def save(self):
+        """임시 파일에 쓴 뒤 교체 (중간에 꺼져도 기존 파일이 깨지지 않게)"""
+        with self.lock:
+            data = {'version': CACHE_VERSION, 'entries': list(self.entries.values())}
+        tmp = self.path + '.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logging.warning(f"배치 캐시 저장 실패: {e}")
+
+    def get(self, inv_num, items, topo_data=None):
+        """저장된 배치가 있으면 items로 복원한 Solution, 없으면 None.
+        복원한 배치가 아이템 구성/배치 제약/저장된 점수와 맞지 않으면 (오래되었거나 손으로 고친 파일) 항목을 지운다."""
+        key = loadout_key(inv_num, items)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+        if topo_data is None:
+            rows = (inv_num + GRID_WIDTH - 1) // GRID_WIDTH
+            topo_data = analyze_grid_topology(rows, GRID_WIDTH)
+        sol = Solution(inv_num, items, topo_data)
+        snap = self._snapshot_for(sol, entry.get('layout'))
+        if snap is not None:
+            sol.restore(snap)
+        if snap is None or not sol.is_legal() or sol.score != entry.get('score'):
+            logging.warning("배치 캐시 항목이 현재 아이템 구성/배치 규칙과 맞지 않아 지웁니다")
+            with self.lock:
+                self.misses += 1
+            self.discard(key)
+            return None
+        with self.lock:
+            if key in self.entries: self.entries.move_to_end(key)
+            self.hits += 1
+        sol.proven_optimal = entry.get('proven_optimal', False)
+        sol.run_info = {'strategy': 'cache', 'iterations': 0, 'elapsed': 0.0, 'stop_reason': 'cache_hit',
+                        'proven_optimal': sol.proven_optimal}
+        logging.info(f"배치 캐시 적중: 점수 {sol.score}")
+        return sol
+
+    def put(self, sol):
+        """sol의 배치를 저장 (같은 로드아웃에 더 높은 점수가 이미 있으면 유지). 제약을 어긴 배치는 저장하지 않음"""
+        if not sol.is_legal():
+            logging.info("배치 제약을 만족하지 않는 배치는 캐시에 저장하지 않습니다")
+            return
+        key = loadout_key(sol.inv_num, sol.items)
+        sigs = [signature_text(item) for item in sol.items]
+        layout = [[idx, sigs[slot], sol.rotations[idx]] for idx, slot in enumerate(sol.slots) if slot != -1]
+        entry = {'key': key, 'inv_num': sol.inv_num, 'score': sol.score, 'layout': layout,
+                 'proven_optimal': bool(sol.proven_optimal)}
+        with self.lock:
+            old = self.entries.get(key)
+            better = old is None or entry['score'] > old['score']
+            if better or (entry['proven_optimal'] and not old.get('proven_optimal')):
+                self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        self.save()
+
+    def discard(self, key):
+        """항목 하나를 지우고 파일에 반영"""
+        with self.lock:
+            if self.entries.pop(key, None) is None: return
+        self.save()
+
+    @staticmethod
+    def _snapshot_for(sol, layout):
+        """저장된 (칸, 서명, 회전) 목록 -> sol.items 인덱스로 된 snapshot. 서명이 같은 아이템끼리는 서로 바꿔 써도 된다.
+        형식이 틀리거나, 칸이 겹치거나 잠겨 있거나, 회전값이 아이템에 맞지 않으면 None"""
+        pool = {}
+        for i, item in enumerate(sol.items):
+            pool.setdefault(signature_text(item), []).append(i)
+        slots = [-1] * sol.size
+        rotations = bytearray(sol.size)
+        try:
+            for idx, sig, rot in layout:
+                if not isinstance(idx, int) or not sol.masks.valid_mask >> idx & 1 or slots[idx] != -1: return None
+                if not pool.get(sig) or rot not in range(4): return None
+                slot = pool[sig].pop()
+                table = sol.tables[slot]
+                if table is None and rot != 0: return None
+                slots[idx] = slot
+                rotations[idx] = table.canonical[rot] if table else 0
+        except (TypeError, ValueError):
+            return None
+        if any(pool.values()): return None
+        return slots, bytes(rotations), 0
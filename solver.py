@@ -1,26 +1,95 @@
 # solver.py
 import random
-import copy
-import time
 import logging
-from logic_utils import get_rotated_directions, analyze_grid_topology
+from logic_utils import (get_rotated_directions, analyze_grid_topology, get_rotation_table, get_influence_table,
+                         get_cell_rotations, compile_tablets, signature_text, is_mirror_closed, constraint_set)
+from annealing import HillClimbAcceptor, AnnealingAcceptor, initial_temperature, make_schedule
+from bitboard import get_grid_masks, cell_bit, iter_bits
+from constraints import get_constraint_index, is_isolated
+from stopping import StoppingPolicy, auto_time_budget, STOP_TIME, STOP_EXHAUSTED, STOP_REQUESTED
+from solver_stats import SolverStats, phase_timer
+from data import tablets as catalog_tablets
 
 GRID_WIDTH = 6
 
+# 석판 회전 테이블은 모듈 로드 시 한 번만 컴파일
+ROTATION_TABLES = compile_tablets(catalog_tablets)
+
 
 class Solution:
-    def __init__(self, inv_num, items, topo_data):
+    # True면 매 증분 갱신 후 전체 evaluate()와 비교 (디버그용, 느림)
+    debug_scoring = False
+    # 완전 탐색으로 최적임이 증명된 해인지
+    proven_optimal = False
+    # run_solver(stats=True)일 때의 계측 결과 (solver_stats.SolverStats)
+    stats = None
+    # seed_layout에서 제자리에 옮겨 온 아이템 비율 (0~1, 이전 배치가 없거나 버렸으면 0)
+    seed_kept = 0.0
+
+    # 이동 연산자별 선택 가중치 (mutate에서 사용)
+    move_weights = {
+        'rotate': 4,       # 석판 회전
+        'swap': 3,         # 두 아이템 위치 교환
+        'relocate': 2,     # 아이템을 빈칸으로 이동
+        'swap_kind': 2,    # 석판 <-> 아티팩트 위치 교환
+        'shift_group': 1,  # H_PAIR / H_ROW_GROUP 묶음 통째로 이동
+    }
+
+    def __init__(self, inv_num, items, topo_data, rng=None, seed_layout=None, stats=None):
         self.inv_num = inv_num
+        self.stats = stats
         self.grid_height = (inv_num + GRID_WIDTH - 1) // GRID_WIDTH
-        self.grid = [[None for _ in range(GRID_WIDTH)] for _ in range(self.grid_height)]
+        self.size = self.grid_height * GRID_WIDTH
         self.topo_data = topo_data
+        self.rng = rng or random.Random()  # 이동 연산자용 난수 (시드 고정 가능)
+
+        # [배치 상태] 칸마다 아이템 인덱스(-1 = 빈칸)와 회전값 1바이트만 보관
+        # 아이템 객체 자체는 self.items에서 읽기 전용으로 공유한다.
+        self.items = list(items)
+        self.item_index = {id(item): i for i, item in enumerate(self.items)}
+        self.tables = [get_rotation_table(item) if item.item_type == 'Tablet' else None for item in self.items]
+        # 석판: 회전별/칸별 (대상 칸, 값) 목록 (그리드 크기별 캐시 공유)
+        # 아티팩트: 칸별 버프 배율 (열쇠 행 조합, 천칭 좌우, 필수 x2를 미리 반영)
+        self.influence = [get_influence_table(inv_num, t) if t else None for t in self.tables]
+        # 석판: 칸별로 효과가 서로 다른 회전 후보 (회전 이동이 점수를 못 바꾸는 제자리 회전을 고르지 않도록)
+        self.cell_rotations = [get_cell_rotations(inv_num, t) if t else None for t in self.tables]
+        no_buff = [0] * self.size
+        self.buff_mult = [[self.buff_value(item, c // GRID_WIDTH, c % GRID_WIDTH, 1) for c in range(self.size)]
+                          if item.item_type == 'Artifact' else no_buff for item in self.items]
+        self.slots = [-1] * self.size
+        self.rotations = bytearray(self.size)
+        self.positions = [-1] * len(self.items)  # 아이템 인덱스 -> 놓인 칸
+
+        # [비트보드] 점유 칸 비트마스크와 그리드 고정 마스크(잠긴 칸, 행/열/대각선)
+        self.masks = get_grid_masks(inv_num)
+        self.occupied = 0
+
+        # [배치 제약] 아이템별로 놓을 수 있는 칸 마스크 (top/bottom/edge/inside/left_or_right)
+        # isolated 아이템은 주변 8칸이 비어 있어야 하므로 배치가 바뀔 때마다 따로 검사
+        cindex = get_constraint_index(inv_num)
+        self.legal = [cindex.legal_mask(item) for item in self.items]
+        self.isolated = [i for i, item in enumerate(self.items) if is_isolated(item)]
+
+        # [되돌리기 로그] 이동 한 번 동안 바뀐 값의 이전 상태
+        self.undo_log = []   # (칸, 이전 아이템, 이전 회전)
+        self.score_log = []  # (칸, 이전 칸 점수, 이전 참조 칸)
+        self.undo_score = 0
 
         # 1. 아이템 그룹핑
-        self.groups = self.preprocess_items(items)
-        # 2. 스마트 배치
-        self.fill_grid_smartly()
-        # 3. 점수 계산
-        self.score = self.evaluate()
+        with phase_timer(stats, 'preprocess_items'):
+            self.groups = self.preprocess_items(items)
+        # 2. 스마트 배치 (이전 배치가 주어지면 그 배치를 옮겨 오고 나머지만 채움)
+        if seed_layout:
+            with phase_timer(stats, 'apply_seed_layout'):
+                self.apply_seed_layout(seed_layout)
+        else:
+            with phase_timer(stats, 'fill_grid_smartly'):
+                self.fill_grid_smartly()
+        # 3. 이동 연산자가 다룰 아이템 분류
+        self.init_move_sets()
+        # 4. 점수 계산 (칸별 점수 캐시 구성)
+        with phase_timer(stats, 'init_scores'):
+            self.init_scores()
 
     def preprocess_items(self, items):
         """아이템들을 분석하여 묶음(Cluster)과 개별(Single)로 분류"""
@@ -104,16 +173,19 @@ class Solution:
                 if o.constraint and 'harmony' in o.constraint: prio = 35
 
                 if getattr(o, 'scale_position', None): prio = 40
+            # 놓을 수 있는 칸이 제한된 아이템은 칸이 남아 있을 때 먼저
+            if self.legal[self.item_index[id(o)]] != self.masks.valid_mask: prio = max(prio, 45)
+            if is_isolated(o): prio = 60
 
             groups.append({'type': 'SINGLE', 'items': [o], 'priority': prio})
 
         groups.sort(key=lambda x: x['priority'], reverse=True)
         return groups
 
-    def fill_grid_smartly(self):
+    def fill_grid_smartly(self, groups=None):
         center_coords = self.get_sorted_coords(method='center')
 
-        for group in self.groups:
+        for group in self.groups if groups is None else groups:
             g_type = group['type']
             items = group['items']
             item = items[0]
@@ -137,11 +209,203 @@ class Solution:
                 else:
                     self.place_single_item(item, center_coords)
 
+    def apply_seed_layout(self, layout):
+        """이전 배치 layout([(칸, 아이템, 회전)], Solution.layout() 형식)을 현재 아이템 목록에 옮겨 놓는다.
+        서명이 같은 아이템끼리 먼저, 남은 것은 이름이 같은 아이템끼리 짝짓는다 (강화 수치/필수 여부만 바뀐 경우).
+        짝이 없는 새 아이템과 연속 배치가 깨진 묶음은 탐욕 배치로 빈칸에 채운다.
+        가로 묶음은 한 행의 연속 빈칸이 필요하므로 옮겨 온 단일 아이템보다 먼저 놓고, 그 자리와 겹친 아이템은 새로 배치한다.
+        그래도 빈 배치보다 적게 놓이면 이전 배치를 버리고 처음부터 탐욕 배치한다.
+        옮겨 온 아이템 비율(seed_kept)을 반환한다. run_solver는 이 비율만큼만 이어서 탐색하는 설정을 쓴다."""
+        unused = set(range(len(self.items)))
+        by_sig, by_name = {}, {}
+        for i, item in enumerate(self.items):
+            by_sig.setdefault(signature_text(item), []).append(i)
+            by_name.setdefault((item.item_type, item.name), []).append(i)
+
+        def take(pool, key):
+            for i in pool.get(key, ()):
+                if i in unused:
+                    unused.discard(i)
+                    return i
+            return None
+
+        assigned = {}  # 아이템 인덱스 -> (칸, 회전)
+        rest = []
+        for idx, item, rot in layout:
+            if not 0 <= idx < self.inv_num: continue  # 칸 수가 줄어든 경우
+            i = take(by_sig, signature_text(item))
+            if i is None:
+                rest.append((idx, item, rot))
+            else:
+                assigned[i] = (idx, rot)
+        for idx, item, rot in rest:
+            i = take(by_name, (item.item_type, item.name))
+            if i is not None:
+                assigned[i] = (idx, rot)
+
+        # 제약이 바뀌어 (예: UNLOCK 해제) 더는 놓을 수 없는 칸에 있던 아이템은 새로 배치
+        assigned = {i: v for i, v in assigned.items() if self.legal[i] >> v[0] & 1}
+
+        # 묶음은 구성원 전부가 한 행에 연속으로 놓였을 때만 유지 (순서는 놓인 순서를 따름)
+        leftover = []
+        for group in self.groups:
+            members = [self.item_index[id(it)] for it in group['items']]
+            if group['type'] in ('H_PAIR', 'H_ROW_GROUP'):
+                cells = sorted(assigned[m][0] for m in members if m in assigned)
+                if (len(cells) == len(members) and cells[-1] - cells[0] == len(cells) - 1
+                        and cells[0] // GRID_WIDTH == cells[-1] // GRID_WIDTH):
+                    group['items'].sort(key=lambda it: assigned[self.item_index[id(it)]][0])
+                    continue
+                for m in members:
+                    assigned.pop(m, None)
+                leftover.append(group)
+            elif any(m not in assigned for m in members):
+                leftover.append(group)
+
+        def put(i):
+            idx, rot = assigned[i]
+            table = self.tables[i]
+            self.place(idx // GRID_WIDTH, idx % GRID_WIDTH, self.items[i], table.canonical[rot] if table else 0)
+
+        # 1. 유지되는 가로 묶음 -> 2. 새로 놓을 가로 묶음 -> 3. 옮겨 온 나머지 아이템 (빈칸일 때만)
+        group_of = {}
+        for group in self.groups:
+            for it in group['items']:
+                group_of[self.item_index[id(it)]] = group
+        kept_blocks = [i for i in assigned if group_of[i]['type'] in ('H_PAIR', 'H_ROW_GROUP')]
+        for i in kept_blocks:
+            put(i)
+        self.fill_grid_smartly([g for g in leftover if g['type'] in ('H_PAIR', 'H_ROW_GROUP')])
+        leftover = [g for g in leftover if g['type'] not in ('H_PAIR', 'H_ROW_GROUP')]
+        kept = len(kept_blocks)
+        for i in assigned:
+            if i in kept_blocks: continue
+            if self.is_free(assigned[i][0] // GRID_WIDTH, assigned[i][0] % GRID_WIDTH):
+                put(i)
+                kept += 1
+            elif group_of[i] not in leftover:
+                leftover.append(group_of[i])
+        self.fill_grid_smartly(leftover)
+
+        placed = sum(1 for p in self.positions if p != -1)
+        if placed < len(self.items):
+            # 빈 배치에서 시작하면 더 많이 놓을 수 있는지 확인 (이전 배치 때문에 아이템이 빠지지 않도록)
+            warm = self.slots[:], bytes(self.rotations)
+            self.clear_layout()
+            self.fill_grid_smartly()
+            cold = sum(1 for p in self.positions if p != -1)
+            if cold > placed:
+                logging.warning(f"이전 배치에서는 {len(self.items)}개 중 {placed}개만 놓을 수 있어 처음부터 배치합니다")
+                self.seed_kept = 0.0
+                return self.seed_kept
+            self.clear_layout()
+            slots, rotations = warm
+            for idx, slot in enumerate(slots):
+                if slot != -1: self.place(idx // GRID_WIDTH, idx % GRID_WIDTH, self.items[slot], rotations[idx])
+        logging.info(f"이전 배치에서 {kept}개 아이템 유지, {placed - kept}개 새로 배치")
+        self.seed_kept = kept / len(self.items) if self.items else 0.0
+        return self.seed_kept
+
+    def clear_layout(self):
+        """초기 배치용: 모든 칸을 비운다"""
+        self.slots = [-1] * self.size
+        self.rotations = bytearray(self.size)
+        self.positions = [-1] * len(self.items)
+        self.occupied = 0
+
+    def layout(self):
+        """현재 배치를 [(칸, 아이템, 회전)] 목록으로 (다음 탐색의 seed_layout으로 넘길 수 있음)"""
+        return [(idx, self.items[slot], self.rotations[idx]) for idx, slot in enumerate(self.slots) if slot != -1]
+
+    # 거울 대칭을 깨는 제약 (좌우: 마법서는 모래시계 오른쪽 / 상하: 맨 윗줄·맨 아랫줄 관련)
+    H_SENSITIVE = {'right_spell_book'}
+    V_SENSITIVE = {'top', 'bottom', 'top_count'}
+
+    def mirror_axes(self):
+        """배치를 뒤집어도 점수가 같은 거울 대칭 축 목록 ('h' = 좌우, 'v' = 상하).
+        잠긴 칸이 있거나(칸 수가 6의 배수가 아님) 방향에 민감한 아이템이 있으면 그 축은 빠진다."""
+        if self.inv_num % GRID_WIDTH: return ()
+        axes = []
+        for axis in ('h', 'v'):
+            sensitive = self.H_SENSITIVE if axis == 'h' else self.V_SENSITIVE
+            ok = True
+            for item, table in zip(self.items, self.tables):
+                if sensitive & constraint_set(item):
+                    ok = False
+                elif table is not None:
+                    ok = is_mirror_closed(table, axis)
+                elif axis == 'h':
+                    ok = not getattr(item, 'scale_position', None)  # 대립의 천칭 좌/우
+                else:
+                    ok = not (item.name == '캘세더니 열쇠' and item.combo)  # 행 번호별 조합
+                if not ok: break
+            # 가로 묶음은 순서가 정해져 있어 좌우로 뒤집을 수 없다
+            if ok and axis == 'h' and any(g['type'] in ('H_PAIR', 'H_ROW_GROUP') for g in self.groups):
+                ok = False
+            if ok: axes.append(axis)
+        return tuple(axes)
+
     def is_valid_cell(self, r, c):
         if not (0 <= r < self.grid_height and 0 <= c < GRID_WIDTH): return False
-        if (r * GRID_WIDTH + c) >= self.inv_num: return False
+        return not self.masks.locked_mask & cell_bit(r, c)
+
+    @property
+    def blocked(self):
+        """아이템을 놓을 수 없는 칸 (점유 | 잠김)"""
+        return self.occupied | self.masks.locked_mask
+
+    def is_free(self, r, c):
+        return not self.blocked & cell_bit(r, c)
+
+    def is_area_free(self, mask):
+        return not self.blocked & mask
+
+    def isolated_zone(self):
+        """놓여 있는 isolated 아이템의 주변 칸 (다른 아이템을 놓으면 안 됨)"""
+        zone = 0
+        for i in self.isolated:
+            if self.positions[i] != -1:
+                zone |= self.masks.neighbor_masks[self.positions[i]]
+        return zone
+
+    def can_place(self, item, r, c):
+        """(r, c)가 비어 있고 item의 배치 제약을 만족하는지 (초기 배치용)"""
+        idx = r * GRID_WIDTH + c
+        bit = 1 << idx
+        if self.blocked & bit or not self.legal[self.item_index[id(item)]] & bit: return False
+        if self.isolated:
+            if is_isolated(item) and self.masks.neighbor_masks[idx] & self.occupied: return False
+            if self.isolated_zone() & bit: return False
         return True
 
+    def isolation_violations(self):
+        """주변 8칸에 다른 아이템이 있는 isolated 아이템 수"""
+        count = 0
+        for i in self.isolated:
+            idx = self.positions[i]
+            if idx != -1 and self.masks.neighbor_masks[idx] & self.occupied:
+                count += 1
+        return count
+
+    def is_legal(self):
+        """모든 아이템이 배치 제약을 만족하는지"""
+        for i, idx in enumerate(self.positions):
+            if idx != -1 and not self.legal[i] >> idx & 1: return False
+        return not self.isolation_violations()
+
+    def free_cells(self):
+        """비어 있는 (잠기지 않은) 칸 인덱스들"""
+        return iter_bits(self.masks.valid_mask & ~self.occupied)
+
+    def place(self, r, c, item, rotation=0):
+        """초기 배치용: (r, c)에 item을 놓는다 (로그 없음)"""
+        idx = r * GRID_WIDTH + c
+        slot = self.item_index[id(item)]
+        self.slots[idx] = slot
+        self.rotations[idx] = rotation
+        self.positions[slot] = idx
+        self.occupied |= 1 << idx
+
     def place_horizontal_group(self, items):
         """ 헌신의 휘장 + 동료들을 한 줄에 연속 배치"""
         req_len = len(items)
@@ -151,19 +415,15 @@ class Solution:
         rows = list(range(self.grid_height))
         rows.sort(key=lambda r: abs(r - (self.grid_height - 1) / 2))
 
+        blocked = self.blocked
+        legal_rows = any(self.group_fits(items, r, c)
+                         for r in rows for c in self.masks.free_runs(blocked, r, req_len))
         for r in rows:
-            # 해당 행에서 연속된 빈 칸 찾기 (Sliding Window)
+            # 해당 행에서 연속된 빈 칸 찾기 (비트 연산)
             # 최대한 중앙에 오도록 시작점(c) 조정
-            possible_starts = []
-            for c in range(GRID_WIDTH - req_len + 1):
-                # c부터 c+req_len까지 비어있는지 확인
-                is_empty = True
-                for k in range(req_len):
-                    if self.grid[r][c + k] is not None:
-                        is_empty = False
-                        break
-                if is_empty:
-                    possible_starts.append(c)
+            possible_starts = self.masks.free_runs(blocked, r, req_len)
+            if legal_rows:  # 제약을 모두 만족하는 자리가 있으면 그 자리만
+                possible_starts = [c for c in possible_starts if self.group_fits(items, r, c)]
 
             if possible_starts:
                 # 가능한 시작점 중 가장 중앙에 가까운 것 선택
@@ -172,49 +432,59 @@ class Solution:
 
                 # 배치
                 for k in range(req_len):
-                    self.grid[r][best_c + k] = {'item': items[k], 'rotation': 0}
+                    self.place(r, best_c + k, items[k])
                 return  # 성공
+        logging.warning(f"가로 묶음 {[it.name for it in items]}을(를) 놓을 연속 빈칸이 없어 배치하지 못함")
+
+    def group_fits(self, items, r, c):
+        """가로 묶음을 (r, c)부터 놓을 때 모든 구성원의 위치 제약을 만족하는지"""
+        return all(self.legal[self.item_index[id(it)]] >> (r * GRID_WIDTH + c + k) & 1 for k, it in enumerate(items))
 
     def place_horizontal_pair(self, items, coords):
-        """[모래시계][마법서] 배치"""
-        for r, c in coords:
-            if c + 1 < GRID_WIDTH:
-                if self.grid[r][c] is None and self.grid[r][c + 1] is None:
-                    self.grid[r][c] = {'item': items[0], 'rotation': 0}
-                    self.grid[r][c + 1] = {'item': items[1], 'rotation': 0}
-                    return
+        """[모래시계][마법서] 배치 (제약을 만족하는 자리가 없으면 빈자리 아무 곳)"""
+        for check in (True, False):
+            for r, c in coords:
+                if c + 1 < GRID_WIDTH:
+                    if self.is_area_free(cell_bit(r, c) | cell_bit(r, c + 1)):
+                        if check and not self.group_fits(items, r, c): continue
+                        self.place(r, c, items[0])
+                        self.place(r, c + 1, items[1])
+                        return
+        logging.warning(f"가로 묶음 {[it.name for it in items]}을(를) 놓을 연속 빈칸이 없어 배치하지 못함")
 
     def place_vip_tablet(self, tablet):
         """지형 점수가 가장 높은 곳에 배치"""
         best_r, best_c, best_rot = -1, -1, 0
         max_score = -1
+        table = get_rotation_table(tablet)
 
         for r in range(self.grid_height):
             for c in range(GRID_WIDTH):
-                if self.grid[r][c] is not None: continue
+                if not self.can_place(tablet, r, c): continue
 
-                rots = range(4) if tablet.turnable else [0]
-                for rot in rots:
+                for rot in table.distinct:
                     score = 0
-                    dirs = get_rotated_directions(tablet.directions, rot)
-                    for k, v in dirs:
+                    variant = table.variants[rot]
+                    for k, v in variant.keywords:
                         if k == 'ROW':
                             score += self.topo_data['row_len'][r][c] * 10
                         elif k == 'COL':
                             score += self.topo_data['col_len'][r][c] * 10
                         elif k == 'SLASH':
                             score += self.topo_data['slash_len'][r][c] * 15
-                        elif isinstance(k, tuple):
-                            tr, tc = r + k[1], c + k[0]
-                            if 0 <= tr < self.grid_height and 0 <= tc < GRID_WIDTH:
-                                score += self.topo_data['center_score'][tr][tc]
+                    for dx, dy, v in variant.offsets:
+                        tr, tc = r + dy, c + dx
+                        if 0 <= tr < self.grid_height and 0 <= tc < GRID_WIDTH:
+                            score += self.topo_data['center_score'][tr][tc]
 
                     if score > max_score:
                         max_score = score
                         best_r, best_c, best_rot = r, c, rot
 
         if best_r != -1:
-            self.grid[best_r][best_c] = {'item': tablet, 'rotation': best_rot}
+            self.place(best_r, best_c, tablet, best_rot)
+        else:
+            self.place_single_item(tablet, self.get_sorted_coords('center'))
 
     def place_calcedony_key(self, item):
         """캘세더니 열쇠 배치"""
@@ -232,8 +502,8 @@ class Solution:
             for r in range(self.grid_height):
                 if r % 4 == target_mod:
                     for c in cols:
-                        if self.grid[r][c] is None:
-                            self.grid[r][c] = {'item': item, 'rotation': 0}
+                        if self.can_place(item, r, c):
+                            self.place(r, c, item)
                             return
 
         self.place_single_item(item, self.get_sorted_coords('center'))
@@ -246,17 +516,24 @@ class Solution:
 
         for c in target_cols:
             for r in range(self.grid_height):
-                if self.grid[r][c] is None:
-                    self.grid[r][c] = {'item': item, 'rotation': 0}
+                if self.can_place(item, r, c):
+                    self.place(r, c, item)
                     return
 
         self.place_single_item(item, self.get_sorted_coords('center'))
 
     def place_single_item(self, item, coords):
-        """단순 빈칸 배치"""
+        """단순 빈칸 배치 (제약을 만족하는 빈칸이 없으면 아무 빈칸에 두고 경고)"""
+        if is_isolated(item):
+            coords = coords[::-1]  # 주변을 비워야 하므로 가장자리부터
         for r, c in coords:
-            if self.grid[r][c] is None:
-                self.grid[r][c] = {'item': item, 'rotation': 0}
+            if self.can_place(item, r, c):
+                self.place(r, c, item)
+                return
+        for r, c in coords:
+            if self.is_free(r, c):
+                logging.warning(f"[{item.name}] 배치 제약을 만족하는 빈칸이 없어 제약을 무시하고 배치")
+                self.place(r, c, item)
                 return
 
     def get_sorted_coords(self, method='center'):
@@ -266,15 +543,32 @@ class Solution:
             coords.sort(key=lambda p: (p[0] - center_r) ** 2 + (p[1] - center_c) ** 2)
         return coords
 
+    @property
+    def grid(self):
+        """2차원 그리드 보기 (결과 화면 등 외부 표시용). 호출할 때마다 새로 만든다."""
+        return self.grid_of((self.slots, self.rotations, self.score))
+
+    def grid_of(self, snap):
+        """snapshot()으로 저장한 배치의 2차원 그리드 보기 (탐색 중에도 안전하게 그릴 수 있음)"""
+        slots, rotations, _ = snap
+        grid = [[None for _ in range(GRID_WIDTH)] for _ in range(self.grid_height)]
+        for idx, slot in enumerate(slots):
+            if slot != -1:
+                grid[idx // GRID_WIDTH][idx % GRID_WIDTH] = {'item': self.items[slot], 'rotation': rotations[idx]}
+        return grid
+
+    def item_at(self, idx):
+        slot = self.slots[idx]
+        return self.items[slot] if slot != -1 else None
+
     def evaluate(self):
-        """최종 점수 계산"""
+        """최종 점수 계산 (전체 그리드 순회)"""
         total_score = 0
 
         for r in range(self.grid_height):
             for c in range(GRID_WIDTH):
-                cell = self.grid[r][c]
-                if not cell: continue
-                item = cell['item']
+                item = self.item_at(r * GRID_WIDTH + c)
+                if not item: continue
 
                 # 조화의 수정
                 if item.item_type == 'Artifact' and item.constraint and 'harmony' in item.constraint:
@@ -283,63 +577,462 @@ class Solution:
                         for nc in range(c - 1, c + 2):
                             if (nr, nc) == (r, c): continue
                             if 0 <= nr < self.grid_height and 0 <= nc < GRID_WIDTH:
-                                n_cell = self.grid[nr][nc]
-                                if n_cell and n_cell['item'].item_type == 'Artifact':
-                                    neighbor_levels += n_cell['item'].current_enchant
+                                n_item = self.item_at(nr * GRID_WIDTH + nc)
+                                if n_item and n_item.item_type == 'Artifact':
+                                    neighbor_levels += n_item.current_enchant
                     total_score += neighbor_levels
 
                 if item.item_type == 'Tablet':
-                    dirs = get_rotated_directions(item.directions, cell['rotation'])
+                    dirs = get_rotated_directions(item.directions, self.rotations[r * GRID_WIDTH + c])
                     for k, v in dirs:
                         if isinstance(k, str):
-                            pass
+                            # 키워드 효과: 줄(행/열/대각선) 또는 가장자리 칸 전체
+                            for t_idx in iter_bits(self.masks.line_mask(k, r * GRID_WIDTH + c)):
+                                t_item = self.item_at(t_idx)
+                                if t_item and t_item.item_type == 'Artifact':
+                                    total_score += self.buff_value(t_item, t_idx // GRID_WIDTH, t_idx % GRID_WIDTH, v)
                         elif isinstance(k, tuple):
                             tr, tc = r + k[1], c + k[0]
                             if 0 <= tr < self.grid_height and 0 <= tc < GRID_WIDTH:
-                                target = self.grid[tr][tc]
-                                if target and target['item'].item_type == 'Artifact':
-                                    t_item = target['item']
-                                    p = v if isinstance(v, int) else 1
-
-                                    if t_item.name == '캘세더니 열쇠':
-                                        combo_order = ['견고', '잉걸불', '빙하', '마법공학']
-                                        row_combo = combo_order[tr % 4]
-                                        if t_item.combo and row_combo not in t_item.combo:
-                                            p = 0
-
-                                    if getattr(t_item, 'scale_position', None):
-                                        is_left_req = (t_item.scale_position == "좌측")
-                                        is_left_real = (tc < GRID_WIDTH / 2)
-                                        if is_left_req != is_left_real:
-                                            p = 0
-
-                                    if t_item.priority: p *= 2
-                                    total_score += p
+                                t_item = self.item_at(tr * GRID_WIDTH + tc)
+                                if t_item and t_item.item_type == 'Artifact':
+                                    total_score += self.buff_value(t_item, tr, tc, v)
         return total_score
 
-    def mutate(self):
-        r, c = random.randint(0, self.grid_height - 1), random.randint(0, GRID_WIDTH - 1)
-        if self.grid[r][c] and self.grid[r][c]['item'].item_type == 'Tablet':
-            if self.grid[r][c]['item'].turnable:
-                self.grid[r][c]['rotation'] = (self.grid[r][c]['rotation'] + 1) % 4
-
-
-def run_solver(inv_num, flat_items, max_time=3):
-    rows = (inv_num + GRID_WIDTH - 1) // GRID_WIDTH
-    topo_data = analyze_grid_topology(rows, GRID_WIDTH)
-
-    current_sol = Solution(inv_num, flat_items, topo_data)
-    best_sol = copy.deepcopy(current_sol)
-
-    start_time = time.time()
-    while time.time() - start_time < max_time:
-        next_sol = copy.deepcopy(current_sol)
-        next_sol.mutate()
-        next_score = next_sol.evaluate()
-
-        if next_score >= current_sol.score:
-            current_sol = next_sol
-            if next_score > best_sol.score:
-                best_sol = copy.deepcopy(next_sol)
+    def buff_value(self, t_item, tr, tc, v):
+        """(tr, tc)에 놓인 아티팩트 t_item이 석판 효과 v로 받는 점수"""
+        p = v if isinstance(v, int) else 1
+
+        if t_item.name == '캘세더니 열쇠':
+            combo_order = ['견고', '잉걸불', '빙하', '마법공학']
+            row_combo = combo_order[tr % 4]
+            if t_item.combo and row_combo not in t_item.combo:
+                p = 0
+
+        if getattr(t_item, 'scale_position', None):
+            is_left_req = (t_item.scale_position == "좌측")
+            is_left_real = (tc < GRID_WIDTH / 2)
+            if is_left_req != is_left_real:
+                p = 0
+
+        if t_item.priority: p *= 2
+        return p
+
+    # ------------------------------------------------------------
+    # [증분 점수 계산]
+    # 칸마다 (기여 점수, 참조한 칸 목록)을 저장해 두고,
+    # 이동 후에는 바뀐 칸과 그 칸을 참조하는 칸만 다시 계산한다.
+    # ------------------------------------------------------------
+    def cell_contribution(self, idx):
+        """idx 칸의 아이템이 만들어내는 점수와 그 점수가 참조하는 칸 목록"""
+        item = self.item_at(idx)
+        if not item: return 0, ()
+        r, c = divmod(idx, GRID_WIDTH)
+        score = 0
+        reads = []
+
+        # 조화의 수정: 주변 8칸의 아티팩트 강화 수치 합
+        if item.item_type == 'Artifact' and item.constraint and 'harmony' in item.constraint:
+            for nr in range(r - 1, r + 2):
+                for nc in range(c - 1, c + 2):
+                    if (nr, nc) == (r, c): continue
+                    if 0 <= nr < self.grid_height and 0 <= nc < GRID_WIDTH:
+                        n_idx = nr * GRID_WIDTH + nc
+                        reads.append(n_idx)
+                        n_item = self.item_at(n_idx)
+                        if n_item and n_item.item_type == 'Artifact':
+                            score += n_item.current_enchant
+
+        # 석판: 가리키는 칸의 아티팩트에 버프
+        if item.item_type == 'Tablet':
+            slots, buff_mult = self.slots, self.buff_mult
+            for t_idx, v in self.influence[slots[idx]][self.rotations[idx]][idx]:
+                reads.append(t_idx)
+                t_slot = slots[t_idx]
+                if t_slot >= 0:
+                    score += v * buff_mult[t_slot][t_idx]
+        return score, reads
+
+    def init_scores(self):
+        """칸별 점수 캐시와 역참조(readers) 테이블을 처음부터 구성"""
+        self.cell_scores = [0] * self.size
+        self.cell_reads = [()] * self.size
+        self.readers = [set() for _ in range(self.size)]
+
+        total = 0
+        for idx in range(self.size):
+            score, reads = self.cell_contribution(idx)
+            self.cell_scores[idx] = score
+            self.cell_reads[idx] = reads
+            for t_idx in reads:
+                self.readers[t_idx].add(idx)
+            total += score
+        self.score = total
+        return total
+
+    def update_scores(self, changed):
+        """changed 칸들이 바뀐 뒤 영향받는 칸만 다시 계산해 점수를 갱신"""
+        dirty = set(changed)
+        for idx in changed:
+            dirty.update(self.readers[idx])
+
+        for idx in dirty:
+            old_reads = self.cell_reads[idx]
+            for t_idx in old_reads:
+                self.readers[t_idx].discard(idx)
+            score, reads = self.cell_contribution(idx)
+            for t_idx in reads:
+                self.readers[t_idx].add(idx)
+            self.score_log.append((idx, self.cell_scores[idx], old_reads))
+            self.score += score - self.cell_scores[idx]
+            self.cell_scores[idx] = score
+            self.cell_reads[idx] = reads
+
+        if self.debug_scoring:
+            self.check_score()
+        return self.score
+
+    def check_score(self):
+        """[디버그] 증분 점수와 전체 evaluate() 결과 비교"""
+        full = self.evaluate()
+        if full != self.score:
+            logging.error(f"증분 점수 불일치: delta={self.score}, full={full}")
+            raise AssertionError(f"incremental score {self.score} != evaluate() {full}")
+
+    # ------------------------------------------------------------
+    # [이동 & 되돌리기]
+    # ------------------------------------------------------------
+    def begin_move(self):
+        """새 이동 시작: 직전 이동의 로그를 버리고 현재 점수를 기억"""
+        self.undo_log.clear()
+        self.score_log.clear()
+        self.undo_score = self.score
+
+    def set_cell(self, idx, slot, rotation):
+        """idx 칸의 아이템/회전을 바꾸고 이전 값을 로그에 남긴다"""
+        self.undo_log.append((idx, self.slots[idx], self.rotations[idx]))
+        self.slots[idx] = slot
+        self.rotations[idx] = rotation
+        if slot == -1:
+            self.occupied &= ~(1 << idx)
+        else:
+            self.positions[slot] = idx
+            self.occupied |= 1 << idx
+
+    def undo(self):
+        """begin_move() 이후의 변경을 모두 되돌린다"""
+        while self.score_log:
+            idx, old_score, old_reads = self.score_log.pop()
+            for t_idx in self.cell_reads[idx]:
+                self.readers[t_idx].discard(idx)
+            for t_idx in old_reads:
+                self.readers[t_idx].add(idx)
+            self.cell_scores[idx] = old_score
+            self.cell_reads[idx] = old_reads
+        while self.undo_log:
+            idx, slot, rotation = self.undo_log.pop()
+            self.slots[idx] = slot
+            self.rotations[idx] = rotation
+            if slot == -1:
+                self.occupied &= ~(1 << idx)
+            else:
+                self.positions[slot] = idx
+                self.occupied |= 1 << idx
+        self.score = self.undo_score
+
+        if self.debug_scoring:
+            self.check_score()
+
+    def init_move_sets(self):
+        """이동 연산자용 아이템 목록 구성 (배치가 끝난 뒤 호출).
+        H_PAIR / H_ROW_GROUP 묶음의 아이템은 개별 이동에서 빠지고 묶음 이동으로만 움직인다."""
+        grouped = set()
+        self.blocks = []
+        for group in self.groups:
+            if group['type'] in ('H_PAIR', 'H_ROW_GROUP'):
+                members = [self.item_index[id(it)] for it in group['items']]
+                grouped.update(members)
+                if all(self.positions[m] != -1 for m in members):
+                    self.blocks.append(members)
+
+        placed = [i for i in range(len(self.items)) if self.positions[i] != -1]
+        self.movable = [i for i in placed if i not in grouped]
+        self.movable_tablets = [i for i in self.movable if self.items[i].item_type == 'Tablet']
+        self.movable_artifacts = [i for i in self.movable if self.items[i].item_type == 'Artifact']
+        self.rotatable = [i for i in placed if self.tables[i] and len(self.tables[i].distinct) > 1]
+
+        ops = {
+            'rotate': self.rotatable,
+            'swap': len(self.movable) >= 2,
+            'relocate': self.movable and self.masks.valid_mask & ~self.occupied,
+            'swap_kind': self.movable_tablets and self.movable_artifacts,
+            'shift_group': self.blocks,
+        }
+        self.move_ops = [name for name, w in self.move_weights.items() if w > 0 and ops.get(name)]
+        self.move_cum_weights = []
+        total = 0
+        for name in self.move_ops:
+            total += self.move_weights[name]
+            self.move_cum_weights.append(total)
 
-    return best_sol
\ No newline at end of file
+    def mutate(self):
+        """가중치에 따라 이동 연산자 하나를 골라 적용. 바뀐 칸 목록을 반환 (변화가 없으면 빈 리스트)"""
+        self.begin_move()
+        if not self.move_ops: return []
+        op = self.rng.choices(self.move_ops, cum_weights=self.move_cum_weights)[0]
+        if not self.isolated:
+            return getattr(self, 'move_' + op)()
+
+        # isolated 아이템이 있으면 이동 후 검사해, 주변이 비어 있어야 할 아이템을 새로 막는 이동은 취소
+        before = self.isolation_violations()
+        changed = getattr(self, 'move_' + op)()
+        if changed and self.isolation_violations() > before:
+            self.undo()
+            return []
+        return changed
+
+    def move_rotate(self):
+        """석판 하나를 다음 (이 칸에서 효과가 서로 다른) 회전으로. 어느 회전이든 같은 칸이면 이동 없음"""
+        slot = self.rng.choice(self.rotatable)
+        idx = self.positions[slot]
+        rots, canonical = self.cell_rotations[slot][idx]
+        if len(rots) < 2: return []
+        next_rot = rots[(rots.index(canonical[self.rotations[idx]]) + 1) % len(rots)]
+        self.set_cell(idx, slot, next_rot)
+        return [idx]
+
+    def swap_items(self, a, b):
+        """두 아이템의 칸을 맞바꾼다 (회전은 아이템을 따라감). 배치 제약에 어긋나면 하지 않음"""
+        ia, ib = self.positions[a], self.positions[b]
+        if not (self.legal[a] >> ib & 1 and self.legal[b] >> ia & 1): return []
+        ra, rb = self.rotations[ia], self.rotations[ib]
+        self.set_cell(ia, b, rb)
+        self.set_cell(ib, a, ra)
+        return [ia, ib]
+
+    def move_swap(self):
+        a, b = self.rng.sample(self.movable, 2)
+        return self.swap_items(a, b)
+
+    def move_swap_kind(self):
+        return self.swap_items(self.rng.choice(self.movable_tablets), self.rng.choice(self.movable_artifacts))
+
+    def move_relocate(self):
+        slot = self.rng.choice(self.movable)
+        free = list(iter_bits(self.masks.valid_mask & ~self.occupied & self.legal[slot]))
+        if not free: return []
+        src, dst = self.positions[slot], self.rng.choice(free)
+        rotation = self.rotations[src]
+        self.set_cell(src, -1, 0)
+        self.set_cell(dst, slot, rotation)
+        return [src, dst]
+
+    def move_shift_group(self):
+        """가로 묶음을 다른 행/열의 연속 빈칸으로 통째로 이동 (순서 유지)"""
+        members = self.rng.choice(self.blocks)
+        old_cells = [self.positions[m] for m in members]
+        own_mask = 0
+        for idx in old_cells:
+            own_mask |= 1 << idx
+        blocked = self.blocked & ~own_mask
+
+        start = old_cells[0]
+        targets = []
+        for r in range(self.grid_height):
+            for c in self.masks.free_runs(blocked, r, len(members)):
+                t = r * GRID_WIDTH + c
+                if t != start and all(self.legal[m] >> (t + k) & 1 for k, m in enumerate(members)):
+                    targets.append(t)
+        if not targets: return []
+
+        new_start = self.rng.choice(targets)
+        for idx in old_cells:
+            self.set_cell(idx, -1, 0)
+        new_cells = []
+        for k, m in enumerate(members):
+            self.set_cell(new_start + k, m, 0)
+            new_cells.append(new_start + k)
+        return old_cells + new_cells
+
+    def snapshot(self):
+        """현재 배치의 가벼운 사본 (최고 해 저장용)"""
+        return self.slots[:], bytes(self.rotations), self.score
+
+    def restore(self, snap):
+        """snapshot()으로 저장한 배치로 되돌리고 점수 캐시를 다시 구성"""
+        slots, rotations, _ = snap
+        self.slots = list(slots)
+        self.rotations = bytearray(rotations)
+        self.positions = [-1] * len(self.items)
+        for idx, slot in enumerate(self.slots):
+            if slot != -1: self.positions[slot] = idx
+        self.occupied = sum(1 << idx for idx, slot in enumerate(self.slots) if slot != -1)
+        self.begin_move()
+        self.init_scores()
+
+
+def make_acceptor(strategy, sol, schedule='geometric', rng=random, accept_prob=0.5):
+    """탐색 전략 이름 -> 수락 규칙 객체. accept_prob: 평균 악화 이동의 시작 수락 확률 (담금질)"""
+    if strategy == 'hill_climb':
+        return HillClimbAcceptor()
+    if strategy == 'annealing':
+        t0 = initial_temperature(sol, accept_prob=accept_prob)
+        logging.info(f"담금질 시작 온도: {t0:.4g} (스케줄: {schedule})")
+        return AnnealingAcceptor(make_schedule(schedule, t0), rng)
+    raise ValueError(f"알 수 없는 탐색 전략: {strategy} (가능: {', '.join(STRATEGIES)})")
+
+
+STRATEGIES = ('hill_climb', 'annealing')
+
+# 온도/진행률을 갱신하는 반복 주기
+UPDATE_INTERVAL = 256
+
+# 담금질 시작 수락 확률: 처음부터 / 이전 배치에서 이어서 (낮은 온도에서 시작해 좋은 배치를 흩뜨리지 않음)
+COLD_ACCEPT_PROB = 0.5
+WARM_ACCEPT_PROB = 0.1
+# 이전 배치를 전부 옮겨 왔을 때 자동 시간 제한에 곱하는 비율 (일부만 옮겨 왔으면 그 비율만큼 1에서 줄임)
+WARM_BUDGET_RATIO = 0.35
+
+
+def run_solver(inv_num, flat_items, max_time=3, debug=False, strategy=None, schedule=None,
+               seed=None, workers=1, topo_data=None, exact='auto', stopping=None,
+               on_improve=None, stop_event=None, seed_layout=None, stats=False):
+    """max_time: 시간 제한 (초). 'auto'면 아이템 수와 빈칸 수로 정함 (stopping.auto_time_budget)
+    strategy: 'hill_climb'(점수가 떨어지지 않는 이동만 수락, 기본값) 또는 'annealing'(담금질 기법)
+    schedule: 담금질 냉각 스케줄 ('geometric'(기본값), 'linear', 'reheat')
+    seed: 난수 시드 (None이면 매번 다름)
+    workers: 2 이상이면 프로세스 여러 개로 독립 탐색 후 최고 해 반환 (portfolio.run_portfolio).
+        strategy/schedule을 정하지 않으면 워커마다 포트폴리오 기본 조합을 돌려 쓰고, 정한 값은 그 조합만 남긴다.
+    exact: True면 완전 탐색(exact_solver), 'auto'면 탐색 공간이 EXACT_THRESHOLD 미만일 때만.
+        완전 탐색은 workers와 관계없이 이 프로세스에서 한 번만 돌린다.
+    stopping: 종료 정책. None이면 문제 크기에 맞춘 기본 정책(개선 없음/정체 감지), False면 시간 제한만.
+    종료 사유는 run_info['stop_reason']에 기록된다.
+    on_improve(sol, snap, elapsed): 최고 점수가 갱신될 때마다 (시작 배치 포함) 호출. snap은 Solution.snapshot()
+        형식이고 점수는 snap[2]. sol은 탐색 중 계속 바뀌므로 그릴 때는 sol.grid_of(snap)을 쓴다.
+    stop_event: is_set()이 되면 현재까지의 최고 해로 다음 반복 전에 끝낸다 (stop_reason 'stopped').
+        다른 스레드에서 탐색을 취소할 때 사용
+    seed_layout: 이전 결과(Solution 또는 Solution.layout())에서 이어서 탐색. 추가/삭제된 아이템은 자동으로 보정.
+        시간 제한('auto')/시작 온도/patience는 옮겨 온 아이템 비율(sol.seed_kept)만큼만 줄인다.
+    stats: True(또는 SolverStats)면 횟수/단계별 시간/최고 점수 기록을 sol.stats에 담는다.
+        on_improve, stats, stopping은 workers=1에서만 쓸 수 있다 (workers > 1이면 ValueError).
+        보고서는 sol.stats.to_json(). 끄면 탐색 루프에 추가 비용이 없다."""
+    if workers > 1:
+        # 워커 프로세스의 진행 상황/계측/종료 정책은 이 프로세스로 가져올 수 없다
+        unsupported = [name for name, value in (('on_improve', on_improve), ('stats', stats), ('stopping', stopping))
+                       if value not in (None, False)]
+        if unsupported:
+            raise ValueError(f"workers > 1에서는 {', '.join(unsupported)}을(를) 쓸 수 없습니다")
+
+    if topo_data is None:
+        rows = (inv_num + GRID_WIDTH - 1) // GRID_WIDTH
+        topo_data = analyze_grid_topology(rows, GRID_WIDTH)
+
+    rng = random.Random(seed)
+    if isinstance(seed_layout, Solution):
+        seed_layout = seed_layout.layout()
+    if stats is True:
+        stats = SolverStats()
+    stats = stats or None
+    sol = Solution(inv_num, flat_items, topo_data, rng, seed_layout, stats)
+    sol.debug_scoring = debug
+    # 이전 배치를 얼마나 옮겨 왔는지에 비례해 이어서 탐색하는 설정을 쓴다 (다른 로드아웃의 배치면 거의 처음부터)
+    warm = sol.seed_kept
+
+    if max_time == 'auto':
+        max_time = auto_time_budget(len(flat_items), max(0, inv_num - len(flat_items)))
+        max_time *= 1 - (1 - WARM_BUDGET_RATIO) * warm
+        logging.info(f"자동 시간 제한: {max_time:.2f}초")
+
+    # 작은 문제는 완전 탐색으로 최적해를 증명 (워커마다 같은 완전 탐색을 반복하지 않도록 여기서 한 번 결정)
+    from exact_solver import estimate_search_space, solve_exact, EXACT_THRESHOLD
+    space = estimate_search_space(sol)
+    use_exact = exact is True or (exact == 'auto' and space < EXACT_THRESHOLD)
+
+    if workers > 1 and not use_exact:
+        from portfolio import run_portfolio, DEFAULT_STRATEGIES
+        strategies = None  # 포트폴리오 기본 조합
+        if strategy is not None or schedule is not None:
+            strategies = [(s, sch) for s, sch in DEFAULT_STRATEGIES
+                          if strategy in (None, s) and schedule in (None, sch)] or [(strategy or 'annealing', schedule)]
+        return run_portfolio(inv_num, flat_items, max_time=max_time, workers=workers, strategies=strategies,
+                             seed=seed, seed_layout=seed_layout, stop_event=stop_event, exact=False, debug=debug)
+
+    strategy = strategy or 'hill_climb'
+    schedule = schedule or 'geometric'
+    if use_exact:
+        logging.info(f"완전 탐색 사용 (예상 경우의 수 {space:.3g})")
+        if on_improve: on_improve(sol, sol.snapshot(), 0.0)
+        if stats is not None: stats.record_best(0.0, 0, sol.score)
+        with phase_timer(stats, 'exact'):
+            nodes, completed, elapsed = solve_exact(sol, max_time, stop_event)
+        if on_improve: on_improve(sol, sol.snapshot(), elapsed)
+        if stats is not None:
+            stats.record_best(elapsed, nodes, sol.score)
+            stats.finish_search(nodes)
+        if completed:
+            reason = STOP_EXHAUSTED
+        elif stop_event is not None and stop_event.is_set():
+            reason = STOP_REQUESTED
+        else:
+            reason = STOP_TIME
+        sol.run_info = {'strategy': 'exact', 'seed': seed, 'iterations': nodes, 'elapsed': elapsed,
+                        'proven_optimal': sol.proven_optimal, 'search_space': space, 'stop_reason': reason}
+        return sol
+    accept_prob = COLD_ACCEPT_PROB - (COLD_ACCEPT_PROB - WARM_ACCEPT_PROB) * warm
+    acceptor = make_acceptor(strategy, sol, schedule, rng, accept_prob)
+    best = sol.snapshot()
+    best_at = 0  # 최고 점수를 마지막으로 갱신한 반복 번호
+
+    if stopping is None:
+        stopping = StoppingPolicy.for_problem(sol, max_time, warm=warm)
+    elif stopping is False:
+        stopping = StoppingPolicy(max_time)
+    stop_event = stop_event or stopping.stop_event
+    stopping.start()
+    if on_improve: on_improve(sol, best, 0.0)
+    if stats is not None: stats.record_best(0.0, 0, best[2])
+
+    iterations = 0
+    while True:
+        # 중단 요청은 매 반복 확인 (취소 버튼이 바로 반응하도록)
+        if stop_event is not None and stop_event.is_set():
+            stopping.reason = STOP_REQUESTED
+            break
+        if iterations % UPDATE_INTERVAL == 0:
+            if stopping.check(iterations - best_at, best[2]): break
+            acceptor.update(stopping.progress(), iterations - best_at)
+        iterations += 1
+
+        prev_score = sol.score
+        changed = sol.mutate()
+        if not changed: continue
+        next_score = sol.update_scores(changed)
+
+        if acceptor.accept(next_score - prev_score):
+            if next_score > best[2]:
+                best = sol.snapshot()
+                best_at = iterations
+                if on_improve: on_improve(sol, best, stopping.elapsed())
+                if stats is not None: stats.record_best(stopping.elapsed(), iterations, best[2])
+        else:
+            sol.undo()
+
+    elapsed = stopping.elapsed()
+    logging.info(f"탐색 종료 [{acceptor.name}, {stopping.reason}]: {iterations}회 반복 "
+                 f"({iterations / max(elapsed, 1e-9):.0f}회/초), 점수 {best[2]}")
+    logging.info(f"수락 통계: {acceptor.stats.summary()}")
+    sol.restore(best)
+    if stats is not None:
+        stats.phases['search'] = stats.phases.get('search', 0.0) + elapsed
+        stats.finish_search(iterations, acceptor.stats)
+        logging.info(f"탐색 계측: {stats.summary()}")
+    sol.run_info = {
+        'strategy': strategy,
+        'schedule': schedule if strategy == 'annealing' else None,
+        'seed': seed,
+        'iterations': iterations,
+        'elapsed': elapsed,
+        'accept_rate': acceptor.stats.rate(),
+        'stop_reason': stopping.reason,
+    }
+    return sol
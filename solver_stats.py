@@ -0,0 +1,70 @@
+# solver_stats.py
+# run_solver 계측: 반복/채점/수락/거절/개선 횟수, 단계별 소요 시간, 시간에 따른 최고 점수
+# run_solver(stats=True)일 때만 만들어져 Solution.stats에 붙는다. 꺼져 있으면 탐색 루프에 추가 작업이 없다.
+import json
+import time
+from contextlib import contextmanager, nullcontext
+
+
+class SolverStats:
+    """탐색 1회의 계측 결과. to_dict()/to_json()으로 보고서를 얻는다."""
+
+    def __init__(self):
+        self.counters = {
+            'iterations': 0,    # 탐색 루프 반복 수 (완전 탐색이면 방문 노드 수)
+            'evaluations': 0,   # 증분 채점 횟수 (변화가 있는 이동마다 1회)
+            'accepted': 0,
+            'rejected': 0,
+            'noop_moves': 0,    # 제약 등으로 아무것도 바꾸지 못한 이동
+            'improvements': 0,  # 최고 점수 갱신 횟수
+        }
+        self.phases = {}           # 단계 이름 -> 소요 시간 (초)
+        self.best_over_time = []   # (탐색 시작 후 경과 초, 반복 번호, 최고 점수)
+        self.created = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        """with stats.phase('이름'): 블록의 소요 시간을 누적"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def record_best(self, elapsed, iteration, score):
+        if self.best_over_time:
+            self.counters['improvements'] += 1
+        self.best_over_time.append((round(elapsed, 6), iteration, score))
+
+    def finish_search(self, iterations, accept_stats=None):
+        """탐색 루프가 끝난 뒤 반복 수와 수락 통계(annealing.AcceptanceStats)로 카운터를 채운다.
+        카운터를 루프 안에서 올리지 않고 이미 세고 있는 값에서 옮겨 오므로 루프 비용이 늘지 않는다."""
+        c = self.counters
+        c['iterations'] = iterations
+        if accept_stats is not None:
+            c['evaluations'] = accept_stats.proposed
+            c['accepted'] = accept_stats.accepted
+            c['rejected'] = accept_stats.rejected
+            c['noop_moves'] = iterations - accept_stats.proposed
+
+    def to_dict(self):
+        return {
+            'counters': dict(self.counters),
+            'phases': {name: round(sec, 6) for name, sec in self.phases.items()},
+            'best_over_time': [list(entry) for entry in self.best_over_time],
+            'total': round(time.perf_counter() - self.created, 6),
+        }
+
+    def to_json(self, indent=None):
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=indent)
+
+    def summary(self):
+        c = self.counters
+        phases = ', '.join(f"{name} {sec * 1000:.1f}ms" for name, sec in self.phases.items())
+        return (f"반복 {c['iterations']}, 채점 {c['evaluations']}, 수락 {c['accepted']}, 거절 {c['rejected']}, "
+                f"무변화 {c['noop_moves']}, 개선 {c['improvements']} | {phases}")
+
+
+def phase_timer(stats, name):
+    """stats가 None이면 아무것도 하지 않는 컨텍스트"""
+    return stats.phase(name) if stats is not None else nullcontext()
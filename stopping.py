@@ -0,0 +1,106 @@
+# stopping.py
+# 탐색 종료 조건: 시간 제한, 개선 없음(반복 수/시간), 정체(최고 점수 개선량의 이동 평균)
+# 문제 크기(아이템 수, 빈칸 수)로 시간 제한을 정하는 auto_time_budget도 여기 둔다.
+import time
+
+# 종료 사유 (run_info['stop_reason'])
+STOP_TIME = 'time'                  # 시간 제한 도달
+STOP_NO_IMPROVE = 'no_improve'      # patience_iters회 동안 최고 점수 갱신 없음
+STOP_NO_IMPROVE_MS = 'no_improve_ms'  # patience_ms 동안 최고 점수 갱신 없음
+STOP_PLATEAU = 'plateau'            # 최고 점수 개선 속도가 거의 0
+STOP_EXHAUSTED = 'exhausted'        # 완전 탐색을 끝까지 마침 (최적 증명)
+STOP_REQUESTED = 'stopped'          # 외부에서 중단 요청 (stop_event, 예: 결과 화면의 확정 버튼)
+
+# 자동 시간 제한 계수 (초)
+BUDGET_BASE = 0.2
+BUDGET_PER_ITEM = 0.1
+BUDGET_PER_FREE_CELL = 0.02
+BUDGET_MIN = 0.5
+BUDGET_MAX = 10.0
+
+# 움직일 수 있는 아이템 1개당 개선 없이 기다리는 반복 수: 처음부터 / 이전 배치를 전부 옮겨 온 경우
+COLD_PATIENCE = 3000
+WARM_PATIENCE = 1000
+
+
+def auto_time_budget(n_items, free_cells):
+    """아이템 수와 빈칸 수로 정한 시간 제한 (초). 아이템 7개면 약 1초, 40개 + 빈칸 20개면 약 5초."""
+    budget = BUDGET_BASE + BUDGET_PER_ITEM * n_items + BUDGET_PER_FREE_CELL * free_cells
+    return min(BUDGET_MAX, max(BUDGET_MIN, budget))
+
+
+class StoppingPolicy:
+    """run_solver 루프가 UPDATE_INTERVAL회마다 check()를 불러 종료 여부를 묻는다.
+    max_time: 시간 제한 (초)
+    patience_iters / patience_ms: 최고 점수가 이만큼 갱신되지 않으면 종료 (None이면 사용 안 함)
+    plateau_tol: 검사 1회당 최고 점수 개선량의 지수 이동 평균이 |최고 점수| * plateau_tol 미만이면 정체로 보고 종료
+    min_progress: 시간 제한의 이 비율이 지나기 전에는 시간 외 조건으로 멈추지 않음 (담금질 초반 보호)
+    stop_event: is_set()이 True가 되면 즉시 종료 (threading.Event 등)"""
+
+    def __init__(self, max_time, patience_iters=None, patience_ms=None, plateau_tol=None,
+                 plateau_smoothing=0.02, min_progress=0.1, stop_event=None):
+        self.max_time = max_time
+        self.patience_iters = patience_iters
+        self.patience_ms = patience_ms
+        self.plateau_tol = plateau_tol
+        self.plateau_smoothing = plateau_smoothing
+        self.min_progress = min_progress
+        self.stop_event = stop_event
+        self.reason = None
+        self.start()
+
+    @classmethod
+    def for_problem(cls, sol, max_time, warm=0.0):
+        """움직일 수 있는 아이템 수에 비례한 patience를 쓰는 기본 정책.
+        warm: 이전 배치에서 옮겨 온 아이템 비율 (0~1, True = 1). 전부 옮겨 왔으면 이미 좋은 배치이므로 patience를 1/3로"""
+        n_movable = max(1, len(sol.movable))
+        patience = int(COLD_PATIENCE - (COLD_PATIENCE - WARM_PATIENCE) * warm) * n_movable
+        return cls(max_time, patience_iters=patience, plateau_tol=1e-4)
+
+    def start(self):
+        self.start_time = time.time()
+        self.best_score = None
+        self.best_time = self.start_time
+        self.gain_avg = None  # 검사 1회당 최고 점수 개선량의 이동 평균
+        self.reason = None
+
+    def elapsed(self):
+        return time.time() - self.start_time
+
+    def progress(self, now=None):
+        now = time.time() if now is None else now
+        return (now - self.start_time) / self.max_time if self.max_time > 0 else 1.0
+
+    def check(self, since_best, best_score):
+        """종료해야 하면 사유 문자열, 아니면 None. since_best = 최고 점수 갱신 후 지난 반복 수"""
+        if self.stop_event is not None and self.stop_event.is_set():
+            self.reason = STOP_REQUESTED
+            return self.reason
+        now = time.time()
+        if now - self.start_time >= self.max_time:
+            self.reason = STOP_TIME
+            return self.reason
+
+        gain = 0
+        if self.best_score is None or best_score > self.best_score:
+            if self.best_score is not None:
+                gain = best_score - self.best_score
+            self.best_score = best_score
+            self.best_time = now
+        # 이동 평균은 첫 개선부터 시작 (한 번도 개선이 없으면 patience 조건에 맡김)
+        if self.gain_avg is not None:
+            a = self.plateau_smoothing
+            self.gain_avg = a * gain + (1 - a) * self.gain_avg
+        elif gain > 0:
+            self.gain_avg = gain
+
+        if self.progress(now) < self.min_progress:
+            return None
+        if self.patience_iters is not None and since_best >= self.patience_iters:
+            self.reason = STOP_NO_IMPROVE
+        elif self.patience_ms is not None and (now - self.best_time) * 1000 >= self.patience_ms:
+            self.reason = STOP_NO_IMPROVE_MS
+        elif (self.plateau_tol is not None and self.gain_avg is not None
+              and self.gain_avg < self.plateau_tol * max(1, abs(self.best_score))):
+            self.reason = STOP_PLATEAU
+        return self.reason
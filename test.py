@@ -0,0 +1,307 @@
+# test.py
+# 회귀 테스트 (python -m pytest -q test.py)
+import json
+import random
+import itertools
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from batch_eval import check_against_evaluate
+from benchmark import make_loadout
+from constraints import get_constraint_index
+from cli import solve_loadout
+from loadout import parse_loadout, make_artifact_instance, ARTIFACTS_BY_NAME, LoadoutError
+from logic_utils import analyze_grid_topology, constraint_set, get_cell_rotations, get_influence_table
+from server import SolverService, make_server
+from solution_cache import SolutionCache, loadout_key
+from solver import Solution, run_solver, GRID_WIDTH, ROTATION_TABLES
+
+
+def make_solution(inv_num, n_items, seed):
+    items = make_loadout(inv_num, n_items, seed)
+    rows = (inv_num + GRID_WIDTH - 1) // GRID_WIDTH
+    return Solution(inv_num, items, analyze_grid_topology(rows, GRID_WIDTH), random.Random(seed))
+
+
+@pytest.mark.parametrize('inv_num, n_items, seed', [(12, 8, 0), (36, 20, 1), (60, 40, 2)])
+def test_batch_eval_matches_evaluate(inv_num, n_items, seed):
+    """BatchEvaluator 점수가 Solution.evaluate()와 같아야 한다"""
+    sol = make_solution(inv_num, n_items, seed)
+    assert check_against_evaluate(sol, count=50, seed=seed) == []
+
+
+def grouped_extras():
+    """가로 묶음(모래시계+마법서, 휘장+동료)과 isolated 아이템 (모든 이동 연산자를 쓰도록)"""
+    return [make_artifact_instance(ARTIFACTS_BY_NAME['빛나는 모래시계'], hourglass=True),
+            make_artifact_instance(ARTIFACTS_BY_NAME['아이스 볼트']),
+            make_artifact_instance(ARTIFACTS_BY_NAME['헌신의 휘장']),
+            make_artifact_instance(ARTIFACTS_BY_NAME['금빛 핸드벨'], devotion=True),
+            make_artifact_instance(ARTIFACTS_BY_NAME['차가운 자물쇠'])]
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_incremental_score_and_undo(seed):
+    """mutate() 후 증분 update_scores()는 전체 evaluate()와 같고, undo()는 배치와 점수 캐시를 그대로 되돌린다"""
+    rng = random.Random(seed)
+    items = make_loadout(36, 16, seed) + grouped_extras()
+    sol = Solution(36, items, analyze_grid_topology(6, GRID_WIDTH), random.Random(seed))
+    assert sol.score == sol.evaluate()
+    assert set(sol.move_ops) == set(Solution.move_weights)
+    for _ in range(1500):
+        before = sol.snapshot()
+        state = sol.positions[:], sol.occupied, sol.cell_scores[:], [set(r) for r in sol.readers]
+        changed = sol.mutate()
+        sol.update_scores(changed)
+        assert sol.score == sol.evaluate()
+        if rng.random() < 0.5:
+            sol.undo()
+            assert sol.snapshot() == before
+            assert (sol.positions, sol.occupied, sol.cell_scores, sol.readers) == state
+            assert sol.score == sol.evaluate()
+
+
+def expected_cells(constraint, inv_num):
+    """제약 정의를 칸마다 직접 확인한 놓을 수 있는 칸 집합"""
+    height = (inv_num + GRID_WIDTH - 1) // GRID_WIDTH
+    valid = lambda r, c: 0 <= r < height and 0 <= c < GRID_WIDTH and r * GRID_WIDTH + c < inv_num
+    cells = set()
+    for idx in range(inv_num):
+        r, c = divmod(idx, GRID_WIDTH)
+        edge = not all(valid(nr, nc) for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)))
+        ok = {'top': r == 0, 'bottom': not valid(r + 1, c), 'edge': edge, 'inside': not edge,
+              'left_or_right': c in (0, GRID_WIDTH - 1)}[constraint]
+        if ok: cells.add(idx)
+    return cells
+
+
+@pytest.mark.parametrize('inv_num', [6, 13, 36, 47, 60])
+def test_constraint_masks(inv_num):
+    """ConstraintIndex 마스크가 제약 정의와 같아야 한다 (잠긴 칸이 있는 그리드 포함)"""
+    cindex = get_constraint_index(inv_num)
+    for constraint, mask in cindex.legal.items():
+        assert {idx for idx in range(60) if mask >> idx & 1} == expected_cells(constraint, inv_num), constraint
+
+
+# 위치 제약이 있는 아이템: 은접시/라일리의 회중시계(bottom), 마법 당근/검술 교본(top), 용골 파편/초록 잉크병(edge),
+# 가시덤불/따뜻한 돌(inside), 선의(bottom), 차양(top), 정의(left_or_right)
+CONSTRAINED_LOADOUT = {'tablets': {'선의': 1, '차양': 1, '정의': 2, '과거': 2, '희망': 2},
+                       'artifacts': ['은접시', '라일리의 회중시계', '마법 당근', '검술 교본', '용골 파편', '초록 잉크병',
+                                     '가시덤불', '따뜻한 돌', '힘의 부적', '가시 부적', '눈 결정 목걸이']}
+
+
+@pytest.mark.parametrize('inv_num, strategy, seed', [(30, 'annealing', 0), (36, 'hill_climb', 1), (47, 'annealing', 2)])
+def test_constrained_items_stay_in_mask(inv_num, strategy, seed):
+    """탐색이 끝난 배치에서 제약이 있는 아이템은 모두 제약이 허용하는 칸에 있다"""
+    inv_num, items = parse_loadout({**CONSTRAINED_LOADOUT, 'inv_num': inv_num})
+    sol = run_solver(inv_num, items, max_time=0.5, strategy=strategy, seed=seed, exact=False)
+    assert sol.is_legal()
+    for idx, item, _ in sol.layout():
+        for constraint in constraint_set(item):
+            assert idx in expected_cells(constraint, inv_num), (item.name, constraint, idx)
+
+
+MALFORMED_LOADOUTS = [
+    ([], "로드아웃은 JSON 객체여야 합니다"),
+    ({'inv_num': 0}, "inv_num은 양의 정수여야 합니다: 0"),
+    ({'inv_num': '36'}, "inv_num은 양의 정수여야 합니다: '36'"),
+    ({'inv_num': 6, 'tablets': {'없는 석판': 1}}, "알 수 없는 석판: '없는 석판'"),
+    ({'inv_num': 6, 'tablets': {'희망': -1}}, "[희망] 석판 수량은 0 이상의 정수여야 합니다: -1"),
+    ({'inv_num': 6, 'artifacts': ['없는 아티팩트']}, "알 수 없는 아티팩트: '없는 아티팩트'"),
+    ({'inv_num': 6, 'artifacts': [{'name': '힘의 부적', 'enchant': 9}]}, "[힘의 부적] 강화 수치는 0~3 정수여야 합니다: 9"),
+    ({'inv_num': 6, 'artifacts': [{'name': '힘의 부적', 'unlock': True}]}, "[힘의 부적] UNLOCK으로 풀 수 있는 제약이 없습니다"),
+    ({'inv_num': 6, 'artifacts': [{'name': '힘의 부적', 'position': '좌측'}]}, "[힘의 부적] position은"),
+    ({'inv_num': 6, 'artifacts': [{'name': '힘의 부적', 'devotion': True}]},
+     "[힘의 부적] 동료 소환 아티팩트가 아니어서 devotion을 쓸 수 없습니다"),
+    ({'inv_num': 6, 'artifacts': [{'name': '힘의 부적', 'hourglass': True}]},
+     "[힘의 부적] 마법서가 아니어서 hourglass를 쓸 수 없습니다"),
+    ({'inv_num': 6, 'artifacts': [{'name': '캘세더니 열쇠', 'key_combo': '그림자'}]}, "[캘세더니 열쇠] key_combo는"),
+    ({'inv_num': 6, 'artifacts': [{'name': '힘의 부적', 'key_combo': '견고'}]},
+     "[힘의 부적] key_combo는 캘세더니 열쇠에만 지정합니다"),
+    ({'inv_num': 2, 'tablets': {'희망': 2}, 'artifacts': ['힘의 부적']},
+     "아이템 개수(3)가 인벤토리 칸 수(2)보다 많습니다"),
+]
+
+
+@pytest.mark.parametrize('data, message', MALFORMED_LOADOUTS)
+def test_malformed_loadout(data, message):
+    """잘못된 로드아웃은 LoadoutError이고, CLI/서버 결과의 'error'에도 같은 메시지가 담긴다"""
+    with pytest.raises(LoadoutError) as excinfo:
+        parse_loadout(data)
+    assert str(excinfo.value).startswith(message)
+    result = solve_loadout(7, data)
+    assert result['index'] == 7 and result['error'] == str(excinfo.value)
+    assert 'layout' not in result
+
+
+def test_loadout_defaults():
+    """석판은 수량만큼 복제, 천칭/영원의 식은 좌측, 캘세더니 열쇠는 첫 조합이 기본값"""
+    inv_num, items = parse_loadout({'inv_num': 12, 'tablets': {'희망': 2, '운명': 0},
+                                    'artifacts': ['대립의 천칭', '캘세더니 열쇠', {'name': '가시덤불', 'unlock': True}]})
+    names = [item.name for item in items]
+    assert inv_num == 12 and sorted(names) == sorted(['대립의 천칭', '캘세더니 열쇠', '가시덤불', '희망', '희망'])
+    by_name = {item.name: item for item in items}
+    assert by_name['대립의 천칭'].scale_position == '좌측'
+    assert by_name['캘세더니 열쇠'].combo == {'견고'}
+    assert not by_name['가시덤불'].constraint
+    tablets = [item for item in items if item.name == '희망']
+    assert tablets[0] is not tablets[1] and all(t.quant == 1 for t in tablets)
+
+
+@pytest.mark.parametrize('inv_num', [12, 47])
+def test_cell_rotations(inv_num):
+    """칸별 회전 후보는 그 칸에서 효과가 모두 다르고, 네 회전 모두 효과가 같은 후보로 대응된다"""
+    effect = lambda influence, rot, cell: sorted(influence[rot][cell])
+    for table in ROTATION_TABLES.values():
+        influence = get_influence_table(inv_num, table)
+        for cell, (rots, canonical) in enumerate(get_cell_rotations(inv_num, table)):
+            assert set(rots) <= set(table.distinct)
+            assert len({tuple(effect(influence, rot, cell)) for rot in rots}) == len(rots)
+            if not table.distinct[1:]: continue  # 회전 불가 석판은 회전 0만 쓴다
+            for rot in range(4):
+                assert canonical[rot] in rots
+                assert effect(influence, canonical[rot], cell) == effect(influence, rot, cell)
+
+
+def brute_force_best(sol):
+    """모든 아이템을 놓는 모든 칸 배정/회전 중 제약을 만족하는 배치의 최고 evaluate() 점수 (없으면 None)"""
+    best = None
+    rot_choices = [table.distinct if table else (0,) for table in sol.tables]
+    for cells in itertools.permutations(range(sol.inv_num), len(sol.items)):
+        for rots in itertools.product(*rot_choices):
+            slots = [-1] * sol.size
+            rotations = bytearray(sol.size)
+            for i, (idx, rot) in enumerate(zip(cells, rots)):
+                slots[idx] = i
+                rotations[idx] = rot
+            sol.restore((slots, bytes(rotations), 0))
+            if sol.is_legal():
+                score = sol.evaluate()
+                if best is None or score > best: best = score
+    return best
+
+
+EXACT_LOADOUTS = [
+    {'inv_num': 6, 'tablets': {'희망': 1, '근사': 1}, 'artifacts': [{'name': '힘의 부적', 'enchant': 2}]},
+    {'inv_num': 8, 'tablets': {'착취': 1, '재치': 1}, 'artifacts': [{'name': '가시 부적', 'priority': True}]},
+    {'inv_num': 12, 'tablets': {'악수': 1}, 'artifacts': ['눈 결정 목걸이', {'name': '마법 당근', 'enchant': 4}]},
+]
+
+
+@pytest.mark.parametrize('data', EXACT_LOADOUTS)
+def test_exact_matches_brute_force(data):
+    """작은 그리드에서 완전 탐색 결과가 모든 배치를 직접 채점한 최고 점수와 같아야 한다"""
+    inv_num, items = parse_loadout(data)
+    sol = run_solver(inv_num, items, max_time=10, exact=True)
+    assert sol.run_info['strategy'] == 'exact'
+    assert sol.proven_optimal and sol.run_info['proven_optimal']
+    assert sol.is_legal()
+    assert sol.score == sol.evaluate() == brute_force_best(sol)
+
+
+def test_exact_infeasible_is_not_proven_optimal():
+    """한 줄짜리 그리드에는 'inside' 칸이 없어 제약을 만족하는 배치가 없다"""
+    inv_num, items = parse_loadout({'inv_num': 6, 'tablets': {'희망': 1}, 'artifacts': ['가시덤불']})
+    sol = run_solver(inv_num, items, max_time=10, exact=True)
+    assert brute_force_best(sol) is None
+    assert not sol.is_legal()
+    assert not sol.proven_optimal and not sol.run_info['proven_optimal']
+    assert sol.score == sol.evaluate()
+
+
+@pytest.fixture
+def solver_server():
+    """빈 포트에 띄운 로컬 배치 서비스 (워커 1개, 작은 그리드만 미리 계산)"""
+    service = SolverService(workers=1, queue_size=2, max_budget=0.5, grid_sizes=[12])
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield 'http://%s:%d' % server.server_address[:2]
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+def post_json(url, payload):
+    request = urllib.request.Request(url, json.dumps(payload).encode('utf-8'),
+                                     {'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+@pytest.mark.parametrize('extra, status', [
+    ({}, 200),
+    ({'strategy': 'annealing', 'schedule': 'reheat'}, 200),
+    ({'strategy': 'genetic'}, 400),
+    ({'schedule': 'cubic'}, 400),
+    ({'workers': 0}, 400),
+])
+def test_server_validates_options(solver_server, extra, status):
+    """알 수 없는 strategy/schedule/workers는 500이 아니라 400과 오류 메시지"""
+    payload = {'inv_num': 12, 'tablets': {'희망': 1}, 'artifacts': ['힘의 부적'], 'max_time': 0.2, 'seed': 0}
+    code, result = post_json(solver_server + '/solve', {**payload, **extra})
+    assert code == status
+    if status == 200:
+        assert result['score'] == 1 and len(result['layout']) == 2
+    else:
+        assert list(extra)[0] in result['error']
+
+
+def test_solution_cache_round_trip(tmp_path):
+    """put -> get 복원, 입력 순서와 무관한 키, LRU 제거, 다시 연 파일에서 읽기"""
+    path = str(tmp_path / 'cache.json')
+    cache = SolutionCache(path, max_entries=2)
+    sols = [run_solver(12, make_loadout(12, 6, seed), max_time=0.2, seed=seed, exact=False) for seed in range(3)]
+    cache.put(sols[0])
+
+    shuffled = sols[0].items[::-1]
+    assert loadout_key(12, shuffled) == loadout_key(12, sols[0].items)
+    hit = cache.get(12, shuffled)
+    assert hit is not None and hit.score == sols[0].score == hit.evaluate()
+    assert sorted((idx, item.name) for idx, item, _ in hit.layout()) == \
+        sorted((idx, item.name) for idx, item, _ in sols[0].layout())
+
+    cache.put(sols[1])
+    cache.put(sols[2])  # 가장 오래 안 쓴 sols[0]이 밀려난다
+    assert cache.get(12, sols[0].items) is None
+    reopened = SolutionCache(path, max_entries=2)
+    assert [reopened.get(12, sol.items).score for sol in sols[1:]] == [sol.score for sol in sols[1:]]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.parametrize('tamper', ['score', 'overlap', 'rotation', 'illegal'])
+def test_solution_cache_drops_invalid_entries(tmp_path, tamper):
+    """손으로 고쳤거나 오래된 항목은 돌려주지 않고 파일에서도 지운다"""
+    path = str(tmp_path / 'cache.json')
+    inv_num, items = parse_loadout({'inv_num': 18, 'tablets': {'희망': 1},
+                                    'artifacts': ['힘의 부적', '용골 파편']})
+    sol = run_solver(inv_num, items, max_time=1, exact=True)
+    cache = SolutionCache(path)
+    cache.put(sol)
+
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    entry = data['entries'][0]
+    layout = entry['layout']
+    if tamper == 'score':
+        entry['score'] += 1
+    elif tamper == 'overlap':
+        layout[1][0] = layout[0][0]
+    elif tamper == 'rotation':
+        artifact = next(cell for cell in layout if cell[1].startswith('["A"'))
+        artifact[2] = 2
+    else:  # 용골 파편(가장자리 전용)을 안쪽 칸으로
+        edge_item = next(cell for cell in layout if '용골 파편' in cell[1])
+        others = {cell[0] for cell in layout}
+        edge_item[0] = next(idx for idx in (7, 8, 9, 10) if idx not in others)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+
+    cache = SolutionCache(path)
+    assert cache.get(inv_num, items) is None
+    assert SolutionCache(path).entries == {}
@@ -0,0 +1,172 @@
+# thumbnails.py
+# 미리 줄여 둔 썸네일 아틀라스 (디스크 캐시)
+# 크기(20, 40, 50, 60px)마다 모든 이미지를 한 장의 PNG에 격자로 붙여 두고, index.json에 이름 -> 칸 번호와
+# 원본 파일의 mtime/크기/해시를 적어 둔다. 원본이 바뀌면 다음 실행 때 자동으로 다시 만든다.
+# 이미지 파일 이름의 .PNG / .png 차이도 resolve_image 한 곳에서 처리한다.
+import os
+import json
+import hashlib
+import logging
+import threading
+from functools import lru_cache
+
+from PIL import Image
+
+from image_cache import decode_image
+
+ATLAS_VERSION = 1
+THUMB_SIZES = (20, 40, 50, 60)
+IMAGE_EXTS = ('.png',)
+ATLAS_COLUMNS = 24
+
+
+@lru_cache(maxsize=None)
+def _directory_index(directory):
+    """디렉터리의 이미지 파일 목록 {이름(확장자 제외): 파일 이름} (확장자 대소문자 무시)"""
+    index = {}
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError:
+        return index
+    for file_name in names:
+        stem, ext = os.path.splitext(file_name)
+        if ext.lower() in IMAGE_EXTS:
+            index.setdefault(stem, file_name)
+    return index
+
+
+def resolve_image(directory, name):
+    """아이템/조합 이름의 이미지 파일 경로 ('이름.PNG', '이름.png' 모두 허용). 없으면 None"""
+    file_name = _directory_index(directory).get(name)
+    return os.path.join(directory, file_name) if file_name else None
+
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+class ThumbnailAtlas:
+    """sources: {종류: 이미지 디렉터리} (예: {'tablets': ..., 'artifacts': ...}). 아틀라스 키는 '종류/이름'"""
+
+    def __init__(self, cache_dir, sources, sizes=THUMB_SIZES):
+        self.cache_dir = cache_dir
+        self.sources = sources
+        self.sizes = tuple(sizes)
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        self.lock = threading.Lock()
+        self.index = None   # ensure()가 끝나면 index.json 내용
+        self.atlases = {}   # 크기 -> 아틀라스 PIL 이미지 (처음 쓸 때 연다)
+        self.path_keys = {}  # 원본 경로 -> 키
+
+    @property
+    def ready(self):
+        return self.index is not None
+
+    def scan(self):
+        """현재 원본 파일 목록 {키: (경로, mtime_ns, 크기)}"""
+        files = {}
+        for kind, directory in self.sources.items():
+            for name, file_name in _directory_index(directory).items():
+                path = os.path.join(directory, file_name)
+                st = os.stat(path)
+                files[f"{kind}/{name}"] = (path, st.st_mtime_ns, st.st_size)
+        return files
+
+    def load_index(self):
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('version') == ATLAS_VERSION and index.get('sizes') == list(self.sizes):
+                return index
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def is_current(self, index, files):
+        """저장된 아틀라스가 원본과 같은지. mtime/크기가 바뀐 파일은 해시로 다시 비교한다.
+        해시가 같으면(내용 그대로 복사/저장된 경우) 다시 만들지 않고 mtime만 갱신해 두도록 True"""
+        stored = index['files']
+        if set(stored) != set(files): return False
+        touched = False
+        for key, (path, mtime, size) in files.items():
+            entry = stored[key]
+            if entry['mtime'] == mtime and entry['size'] == size: continue
+            if entry['size'] != size or entry['sha1'] != file_hash(path): return False
+            entry['mtime'] = mtime
+            touched = True
+        if touched: self.save_index(index)
+        return True
+
+    def ensure(self):
+        """아틀라스가 최신인지 확인하고 필요하면 다시 만든다 (백그라운드 스레드에서 불러도 됨)"""
+        files = self.scan()
+        index = self.load_index()
+        if index is None or not self.is_current(index, files):
+            index = self.build(files)
+        with self.lock:
+            self.path_keys = {os.path.normcase(path): key for key, (path, _, _) in files.items()}
+            self.atlases = {}
+            self.index = index
+
+    def build(self, files):
+        logging.info(f"썸네일 아틀라스 생성: 이미지 {len(files)}개, 크기 {self.sizes}")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        keys = sorted(files)
+        rows = max(1, (len(keys) + ATLAS_COLUMNS - 1) // ATLAS_COLUMNS)
+        sheets = {size: Image.new('RGBA', (ATLAS_COLUMNS * size, rows * size)) for size in self.sizes}
+        entries = {}
+        for slot, key in enumerate(keys):
+            path, mtime, size_bytes = files[key]
+            r, c = divmod(slot, ATLAS_COLUMNS)
+            try:
+                with Image.open(path) as img:
+                    img.load()
+                    for size, sheet in sheets.items():
+                        tile = img.resize((size, size), Image.Resampling.BILINEAR).convert('RGBA')
+                        sheet.paste(tile, (c * size, r * size))
+            except Exception as e:
+                logging.error(f"[ERROR] {os.path.basename(path)} 썸네일 생성 실패: {e}")
+                continue
+            entries[key] = {'slot': slot, 'mtime': mtime, 'size': size_bytes, 'sha1': file_hash(path)}
+
+        for size, sheet in sheets.items():
+            tmp = os.path.join(self.cache_dir, f"atlas_{size}.png.tmp")
+            sheet.save(tmp, format='PNG')
+            os.replace(tmp, os.path.join(self.cache_dir, f"atlas_{size}.png"))
+        index = {'version': ATLAS_VERSION, 'sizes': list(self.sizes), 'columns': ATLAS_COLUMNS, 'files': entries}
+        self.save_index(index)
+        return index
+
+    def save_index(self, index):
+        tmp = self.index_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp, self.index_path)
+
+    def get(self, key, size):
+        """'종류/이름'의 size 썸네일 (PIL 이미지). 아틀라스에 없으면 None"""
+        with self.lock:
+            if self.index is None or size not in self.sizes: return None
+            entry = self.index['files'].get(key)
+            if entry is None: return None
+            sheet = self.atlases.get(size)
+            if sheet is None:
+                with Image.open(os.path.join(self.cache_dir, f"atlas_{size}.png")) as img:
+                    img.load()
+                    sheet = self.atlases[size] = img.copy()
+            r, c = divmod(entry['slot'], self.index['columns'])
+            return sheet.crop((c * size, r * size, (c + 1) * size, (r + 1) * size))
+
+    def load(self, path, size):
+        """ImageCache용 로더: 정사각형 크기이고 아틀라스에 있으면 잘라 쓰고, 아니면 원본을 열어 줄인다"""
+        if size[0] == size[1]:
+            key = self.path_keys.get(os.path.normcase(path))
+            if key is not None:
+                try:
+                    tile = self.get(key, size[0])
+                except OSError as e:
+                    logging.warning(f"썸네일 아틀라스를 읽지 못해 원본을 씁니다: {e}")
+                    tile = None
+                if tile is not None: return tile
+        return decode_image(path, size)